@@ -0,0 +1,289 @@
+# benchmark.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn import set_config
+from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.preprocessing import StandardScaler
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.metrics import accuracy_score, fbeta_score, make_scorer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.generate_synthetic_data import generate_synthetic_data
+from src.validate_data import validate_data
+from src.read_cancer_csv import read_cancer_csv, FEATURE_DTYPES
+from src.read_cancer_data import read_cancer_data, read_columns_to_drop
+from src.compare_benchmarks import compare_benchmarks
+from src.resolve_column_indices import resolve_column_indices
+from src.write_csv import write_csv
+
+
+def time_stage(function, repeats):
+    '''Calls `function` `repeats` times and returns the fastest and the
+    median wall time in seconds together with the value returned by the
+    last call.'''
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        value = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), float(np.median(timings)), value
+
+
+def peak_memory(function):
+    '''Calls `function` once while tracing allocations and returns the
+    largest amount of memory, in bytes, that was allocated during the call
+    (NumPy and pandas buffers included).'''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def machine_info():
+    '''Describes the machine and software versions a benchmark ran with,
+    since timings are only comparable between runs on the same machine.'''
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+        "git_commit": commit
+    }
+
+
+def benchmark_size(n_rows, dtype, seed, repeats, max_tune_rows, cv, columns_to_drop, workdir):
+    '''Times every pipeline stage on one synthetic data set of `n_rows` rows
+    with `dtype` features and returns a list of timing records together with
+    the test scores of the tuned model.'''
+    cancer = generate_synthetic_data(n_rows, seed=seed)
+    cancer = cancer.astype({column: dtype for column in cancer.columns if column != "class"})
+    timings = []
+
+    def record(stage, function, rows=n_rows, measure_memory=False):
+        seconds, median_seconds, value = time_stage(function, repeats)
+        timing = {"stage": stage, "n_rows": n_rows, "dtype": dtype, "stage_rows": rows,
+                  "seconds": seconds, "median_seconds": median_seconds}
+        message = f"{n_rows:>10} rows  {dtype:<8} {stage:<18} {seconds:10.4f} s  (median {median_seconds:.4f} s)"
+        if measure_memory:
+            # traced in a separate, untimed call since tracing slows allocations down
+            timing["peak_bytes"] = peak_memory(function)
+            message += f"  {timing['peak_bytes'] / 2**20:10.1f} MB peak"
+        timings.append(timing)
+        click.echo(message)
+        return value
+
+    record("validate", lambda: validate_data(cancer, dtype=dtype))
+
+    def split_scale():
+        cancer_train, cancer_test = train_test_split(
+            cancer, train_size=0.70, stratify=cancer["class"], random_state=seed
+        )
+        cancer_preprocessor = make_column_transformer(
+            (StandardScaler(), make_column_selector(dtype_include='number')),
+            remainder='passthrough',
+            verbose_feature_names_out=False
+        )
+        cancer_preprocessor.fit(cancer_train)
+        cancer_preprocessor.transform(cancer_train)
+        cancer_preprocessor.transform(cancer_test)
+        return cancer_train, cancer_test, cancer_preprocessor
+    cancer_train, cancer_test, cancer_preprocessor = record("split_scale", split_scale, measure_memory=True)
+
+    # the grid search is quadratic in the number of rows, so tune on a subsample
+    tune_rows = min(len(cancer_train), max_tune_rows)
+    cancer_tune = cancer_train.sample(n=tune_rows, random_state=seed)
+
+    def tune():
+        cancer_tune_grid = GridSearchCV(
+            estimator=make_pipeline(cancer_preprocessor, KNeighborsClassifier()),
+            param_grid={"kneighborsclassifier__n_neighbors": range(1, 100, 3)},
+            cv=cv,
+            scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
+        )
+        return cancer_tune_grid.fit(cancer_tune.drop(columns=["class"]), cancer_tune["class"])
+    cancer_fit = record("tune", tune, rows=tune_rows)
+
+    predictions = record("predict", lambda: cancer_fit.predict(cancer_test.drop(columns=["class"])), rows=len(cancer_test))
+
+    # the same stages with NumPy-native transform output (--transform-output=numpy)
+    set_config(transform_output="default")
+    feature_names = cancer.columns.drop("class")
+    numpy_preprocessor = resolve_column_indices(cancer_preprocessor, cancer[feature_names])
+
+    def split_scale_numpy():
+        features_train, features_test = (
+            np.ascontiguousarray(partition[feature_names].to_numpy())
+            for partition in (cancer_train, cancer_test)
+        )
+        numpy_preprocessor.fit(features_train)
+        numpy_preprocessor.transform(features_train)
+        numpy_preprocessor.transform(features_test)
+        return features_test
+    features_test = record("split_scale_numpy", split_scale_numpy, measure_memory=True)
+    features_tune = np.ascontiguousarray(cancer_tune[feature_names].to_numpy())
+
+    def tune_numpy():
+        cancer_tune_grid = GridSearchCV(
+            estimator=make_pipeline(numpy_preprocessor, KNeighborsClassifier()),
+            param_grid={"kneighborsclassifier__n_neighbors": range(1, 100, 3)},
+            cv=cv,
+            scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
+        )
+        return cancer_tune_grid.fit(features_tune, cancer_tune["class"].to_numpy())
+    numpy_fit = record("tune_numpy", tune_numpy, rows=tune_rows)
+    record("predict_numpy", lambda: numpy_fit.predict(features_test), rows=len(cancer_test))
+    set_config(transform_output="pandas")
+    scores = {
+        "n_rows": n_rows,
+        "dtype": dtype,
+        "n_neighbors": cancer_fit.best_params_["kneighborsclassifier__n_neighbors"],
+        "accuracy": accuracy_score(cancer_test["class"], predictions),
+        "f2": fbeta_score(cancer_test["class"], predictions, beta=2, pos_label='Malignant')
+    }
+
+    csv_path = os.path.join(workdir, "cancer.csv")
+    record("csv_write", lambda: write_csv(cancer, workdir, "cancer.csv"))
+    record("csv_read", lambda: read_cancer_csv(csv_path, dtype=dtype), measure_memory=True)
+    if columns_to_drop:
+        record("csv_read_projected", lambda: read_cancer_data(csv_path, dtype=dtype, columns_to_drop=columns_to_drop))
+
+    parquet_path = os.path.join(workdir, "cancer.parquet")
+    try:
+        record("parquet_write", lambda: cancer.to_parquet(parquet_path, index=False))
+        record("parquet_read", lambda: pd.read_parquet(parquet_path))
+        if columns_to_drop:
+            record("parquet_read_projected",
+                   lambda: read_cancer_data(parquet_path, dtype=dtype, columns_to_drop=columns_to_drop))
+    except ImportError:
+        click.echo("Skipping Parquet stages: no Parquet engine (pyarrow) is installed.")
+
+    return timings, scores
+
+
+def dtype_score_changes(scores):
+    '''Returns how much accuracy and F2 of each non-float64 run move
+    relative to the float64 run on the same data set size.'''
+    scores = pd.DataFrame(scores)
+    reference = scores[scores["dtype"] == "float64"].set_index("n_rows")
+    changes = []
+    for _, row in scores[scores["dtype"] != "float64"].iterrows():
+        if row["n_rows"] not in reference.index:
+            continue
+        changes.append({
+            "n_rows": int(row["n_rows"]),
+            "dtype": row["dtype"],
+            "accuracy_change": row["accuracy"] - reference.loc[row["n_rows"], "accuracy"],
+            "f2_change": row["f2"] - reference.loc[row["n_rows"], "f2"]
+        })
+    return changes
+
+
+@click.command()
+@click.option('--sizes', type=str, default="1000,10000,100000,1000000",
+              help="Comma-separated numbers of rows to benchmark (10^3 to 10^7 are supported; "
+                   "10^7 rows needs roughly 10 GB of memory)")
+@click.option('--dtypes', type=str, default="float64,float32",
+              help="Comma-separated feature dtypes to benchmark; accuracy and F2 are compared with float64")
+@click.option('--repeats', type=int, default=5,
+              help="Number of times each stage is timed; the fastest time is compared and the median is recorded")
+@click.option('--max-tune-rows', type=int, default=10000, help="Maximum number of training rows used in the grid search")
+@click.option('--cv', type=int, default=30, help="Number of cross-validation folds used in the grid search")
+@click.option('--results-to', type=str, help="Path to directory where the benchmark results will be written to")
+@click.option('--label', type=str, default="baseline", help="Name of this benchmark run, used as the results file name")
+@click.option('--compare-to', type=str, help="Optional: path to a previous benchmark results file to compare against")
+@click.option('--tolerance', type=float, default=0.10, help="Relative slowdown allowed before a stage counts as a regression")
+@click.option('--min-slowdown', type=float, default=0.05,
+              help="Seconds a stage must also slow down by to count as a regression, so millisecond stages are not flagged on noise")
+@click.option('--columns-to-drop', type=str,
+              help="Optional: columns to drop; also times reading only the kept columns")
+@click.option('--seed', type=int, help="Random seed", default=123)
+def main(sizes, dtypes, repeats, max_tune_rows, cv, results_to, label, compare_to, tolerance, min_slowdown,
+         columns_to_drop, seed):
+    '''Times each stage of the analysis (validation, split & scale, tuning,
+    prediction, and CSV/Parquet I/O) on synthetic WDBC-shaped data sets of
+    increasing size and saves the timings as JSON, together with how much
+    test accuracy and F2 change with float32 features. Optionally compares
+    the timings with a previous run and exits with an error on regressions.'''
+    np.random.seed(seed)
+    set_config(transform_output="pandas")
+
+    n_rows_list = [int(size) for size in sizes.split(",")]
+    dtype_list = dtypes.split(",")
+    for dtype in dtype_list:
+        if dtype not in FEATURE_DTYPES:
+            raise click.BadParameter(f"dtype must be one of {FEATURE_DTYPES}", param_hint="--dtypes")
+    to_drop = read_columns_to_drop(columns_to_drop) if columns_to_drop else None
+    timings = []
+    scores = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in n_rows_list:
+            for dtype in dtype_list:
+                size_timings, size_scores = benchmark_size(
+                    n_rows, dtype, seed, repeats, max_tune_rows, cv, to_drop, workdir
+                )
+                timings.extend(size_timings)
+                scores.append(size_scores)
+    score_changes = dtype_score_changes(scores)
+    if score_changes:
+        click.echo(pd.DataFrame(score_changes).to_string(index=False))
+
+    results = {
+        "label": label,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": machine_info(),
+        "settings": {"repeats": repeats, "max_tune_rows": max_tune_rows, "cv": cv, "seed": seed,
+                     "columns_to_drop": to_drop},
+        "timings": timings,
+        "scores": scores,
+        "score_changes": score_changes
+    }
+    os.makedirs(results_to, exist_ok=True)
+    with open(os.path.join(results_to, f"{label}.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+    if compare_to:
+        with open(compare_to) as f:
+            baseline = json.load(f)
+        if baseline["machine"]["platform"] != results["machine"]["platform"]:
+            click.echo("Warning: the baseline was recorded on a different machine.")
+        if min(baseline["settings"]["repeats"], repeats) < 3:
+            click.echo("Warning: timings from fewer than 3 repeats are noisy; use --repeats=3 or more.")
+        comparison = compare_benchmarks(baseline, results, tolerance=tolerance, min_slowdown=min_slowdown)
+        write_csv(comparison, results_to, f"{label}_vs_{baseline['label']}.csv")
+        click.echo(comparison.to_string(index=False))
+        if comparison["regression"].any():
+            raise click.ClickException("Performance regressions found (see the ratio column above).")
+
+
+if __name__ == '__main__':
+    main()
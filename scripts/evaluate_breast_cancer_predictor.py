@@ -3,52 +3,63 @@
 # date: 2023-11-27
 
 import click
+import json
 import os
 import sys
 import numpy as np
 import pandas as pd
 import pickle
 from sklearn import set_config
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.compose import make_column_transformer, make_column_selector
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import GridSearchCV
-from sklearn.metrics import fbeta_score, make_scorer
+from sklearn.metrics import accuracy_score, fbeta_score, precision_score, recall_score
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.write_csv import write_csv
+from src.write_json import write_json
+from src.read_cancer_csv import FEATURE_DTYPES
+from src.read_cancer_data import read_cancer_data
+from src.conformal_prediction import conformal_prediction_sets
 
 @click.command()
-@click.option('--scaled-test-data', type=str, help="Path to scaled test data")
+@click.option('--scaled-test-data', type=str, help="Path to scaled test data (CSV or Parquet)")
 @click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
 @click.option('--pipeline-from', type=str, help="Path to directory where the fit pipeline object lives")
 @click.option('--results-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+@click.option('--transform-output', type=click.Choice(["pandas", "numpy"]), default="pandas",
+              help="Use 'numpy' for a pipeline fit with --transform-output=numpy; features are then passed by position")
+@click.option('--operating-point-from', type=str,
+              help="Optional: path to the decision threshold and conformal quantile chosen on the training folds by the fit script")
 @click.option('--seed', type=int, help="Random seed", default=123)
-def main(scaled_test_data, columns_to_drop, pipeline_from, results_to, seed):
+def main(scaled_test_data, columns_to_drop, pipeline_from, results_to, dtype, transform_output, operating_point_from, seed):
     '''Evaluates the breast cancer classifier on the test data 
     and saves the evaluation results.'''
     np.random.seed(seed)
-    set_config(transform_output="pandas")
+    set_config(transform_output="pandas" if transform_output == "pandas" else "default")
 
     # read in data & cancer_fit (pipeline object)
-    cancer_test = pd.read_csv(scaled_test_data)
-    if columns_to_drop:
-        to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
-        cancer_test = cancer_test.drop(columns=to_drop)
+    cancer_test = read_cancer_data(scaled_test_data, dtype=dtype, columns_to_drop=columns_to_drop)
     with open(pipeline_from, 'rb') as f:
         cancer_fit = pickle.load(f)
 
-    # Compute accuracy
-    accuracy = cancer_fit.score(
-        cancer_test.drop(columns=["class"]),
-        cancer_test["class"]
-    )
+    features_test = cancer_test.drop(columns=["class"])
+    if transform_output == "numpy":
+        # the pipeline selects columns by position, so pass the features in file order
+        features_test = np.ascontiguousarray(features_test.to_numpy())
 
-    # Compute F2 score (beta = 2)
+    # one neighbour query gives the vote fractions; the hard predictions are read off them
+    # (argmax picks the class that sorts first on ties, as `predict` does)
+    probabilities = cancer_fit.predict_proba(features_test)
+    classes = cancer_fit.classes_
     cancer_preds = cancer_test.assign(
-        predicted=cancer_fit.predict(cancer_test)
+        predicted=classes[probabilities.argmax(axis=1)]
+    )
+
+    # Compute accuracy (`score` of a GridSearchCV would return its F2 scorer instead)
+    accuracy = accuracy_score(
+        cancer_preds['class'],
+        cancer_preds['predicted']
     )
+
+    # Compute F2 score (beta = 2)
     f2_beta_2_score = fbeta_score(
         cancer_preds['class'],
         cancer_preds['predicted'],
@@ -65,6 +76,41 @@ def main(scaled_test_data, columns_to_drop, pipeline_from, results_to, seed):
     )
     write_csv(confusion_matrix, results_to, "confusion_matrix.csv", index=True)
 
+    # small summary of the test results for the report
+    test_summary = {
+        "accuracy": accuracy,
+        "f2": f2_beta_2_score,
+        "n_test": len(cancer_preds),
+        "confusion_matrix": confusion_matrix.to_dict(orient="index")
+    }
+
+    if operating_point_from:
+        # the threshold and quantile were chosen on out-of-fold training scores;
+        # here they are only applied, so these are honest test estimates
+        with open(operating_point_from) as f:
+            operating_point = json.load(f)
+        if operating_point["classes"] != list(classes):
+            raise ValueError("The operating point was chosen for different classes than the pipeline's.")
+        malignant_scores = probabilities[:, list(classes).index('Malignant')]
+        predicted_at_threshold = np.where(malignant_scores >= operating_point["threshold"], 'Malignant', 'Benign')
+        prediction_sets = conformal_prediction_sets(probabilities, operating_point["quantile"], classes)
+        set_sizes = prediction_sets.sum(axis=1)
+        covered = prediction_sets.to_numpy()[
+            np.arange(len(cancer_preds)), pd.Index(classes).get_indexer(cancer_preds['class'])
+        ]
+        test_summary.update({
+            "threshold": operating_point["threshold"],
+            "threshold_precision": precision_score(cancer_preds['class'], predicted_at_threshold, pos_label='Malignant'),
+            "threshold_recall": recall_score(cancer_preds['class'], predicted_at_threshold, pos_label='Malignant'),
+            "threshold_f2": fbeta_score(cancer_preds['class'], predicted_at_threshold, beta=2, pos_label='Malignant'),
+            "conformal_alpha": operating_point["alpha"],
+            "conformal_coverage": covered.mean(),
+            "conformal_mean_set_size": set_sizes.mean(),
+            "conformal_singleton_fraction": (set_sizes == 1).mean()
+        })
+
+    write_json(test_summary, results_to, "test_summary.json")
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
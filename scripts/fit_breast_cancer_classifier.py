@@ -8,39 +8,56 @@ import altair as alt
 import numpy as np
 import pandas as pd
 import pickle
+import sys
 from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
 from deepchecks.tabular import Dataset
 from sklearn import set_config
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, cross_val_predict
 from sklearn.metrics import fbeta_score, make_scorer
 from joblib import dump
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_csv import FEATURE_DTYPES
+from src.read_cancer_data import read_cancer_data
+from src.resolve_column_indices import resolve_column_indices
+from src.scaled_folds import scaled_folds
+from src.tune_n_neighbors import tune_n_neighbors, out_of_fold_scores
+from src.threshold_curve import threshold_curve
+from src.conformal_prediction import conformal_quantile
+from src.write_csv import write_csv
+from src.write_json import write_json
+from src.validate_data import FEATURE_RANGES
+from src.feature_sketch import make_feature_sketch, update_feature_sketch, save_feature_sketch
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning, module="deepchecks")
 
 
 @click.command()
-@click.option('--training-data', type=str, help="Path to training data")
+@click.option('--training-data', type=str, help="Path to training data (CSV or Parquet)")
 @click.option('--preprocessor', type=str, help="Path to preprocessor object")
 @click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
 @click.option('--pipeline-to', type=str, help="Path to directory where the pipeline object will be written to")
 @click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--summary-to', type=str, help="Optional: path to directory where a JSON summary of the tuning results will be written to")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+@click.option('--transform-output', type=click.Choice(["pandas", "numpy"]), default="pandas",
+              help="Keep features as DataFrames (pandas) or as contiguous NumPy arrays (numpy) inside the pipeline")
+@click.option('--fold-cache', type=str,
+              help="Optional: path to directory where scaled cross-validation folds are cached and reused between runs")
+@click.option('--alpha', type=float, default=0.1,
+              help="Allowed miscoverage of the conformal prediction sets (sets hold the true class with probability 1 - alpha)")
 @click.option('--seed', type=int, help="Random seed", default=123)
-def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, seed):
+def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, summary_to, dtype, transform_output, fold_cache, alpha, seed):
     '''Fits a breast cancer classifier to the training data 
     and saves the pipeline object.'''
     np.random.seed(seed)
-    set_config(transform_output="pandas")
+    set_config(transform_output="pandas" if transform_output == "pandas" else "default")
 
-    # read in data & preprocessor
-    cancer_train = pd.read_csv(training_data)
+    # read in data (skipping the dropped columns while parsing) & preprocessor
+    cancer_train = read_cancer_data(training_data, dtype=dtype, columns_to_drop=columns_to_drop)
     cancer_preprocessor = pickle.load(open(preprocessor, "rb"))
 
-    if columns_to_drop:
-        to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
-        cancer_train = cancer_train.drop(columns=to_drop)
-
     # validate training data for anomalous correlations between target/response variable 
     # and features/explanatory variables, 
     # as well as anomalous correlations between features/explanatory variables
@@ -59,6 +76,15 @@ def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, see
     if not check_feat_feat_corr_result.passed_conditions():
         raise ValueError("Feature-feature correlation exceeds the maximum acceptable threshold.")
 
+    features_train = cancer_train.drop(columns=["class"])
+    labels_train = cancer_train["class"]
+    if transform_output == "numpy":
+        # select columns by precomputed position so the 990 fits in the grid search
+        # pass contiguous arrays around instead of building DataFrames
+        cancer_preprocessor = resolve_column_indices(cancer_preprocessor, features_train)
+        features_train = np.ascontiguousarray(features_train.to_numpy())
+        labels_train = labels_train.to_numpy()
+
     # tune model (here, find K for k-nn using 30 fold cv)
     knn = KNeighborsClassifier()
     cancer_tune_pipe = make_pipeline(cancer_preprocessor, knn)
@@ -68,36 +94,96 @@ def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, see
     }
 
     cv = 30
-    cancer_tune_grid = GridSearchCV(
-        estimator=cancer_tune_pipe,
-        param_grid=parameter_grid,
-        cv=cv,
-        scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
-    )
+    if fold_cache:
+        # preprocess each fold once (or load it from the cache) with the same preprocessor
+        # as the pipeline, and score every k from a single neighbour query per fold
+        # instead of refitting the pipeline
+        fold_preprocessor = cancer_preprocessor
+        if transform_output == "pandas":
+            # the folds are plain arrays, so select the preprocessor's columns by position
+            fold_preprocessor = resolve_column_indices(cancer_preprocessor, features_train)
+        folds = scaled_folds(
+            np.ascontiguousarray(np.asarray(features_train)), labels_train, cv=cv, cache_dir=fold_cache,
+            preprocessor=fold_preprocessor
+        )
+        accuracies_grid = tune_n_neighbors(
+            folds,
+            labels_train,
+            parameter_grid["kneighborsclassifier__n_neighbors"],
+            pos_label='Malignant',
+            beta=2
+        )
+        best_n_neighbors = accuracies_grid.loc[accuracies_grid["mean_test_score"].idxmax(), "n_neighbors"]
+        cancer_fit = make_pipeline(
+            cancer_preprocessor, KNeighborsClassifier(n_neighbors=int(best_n_neighbors))
+        ).fit(features_train, labels_train)
+    else:
+        cancer_tune_grid = GridSearchCV(
+            estimator=cancer_tune_pipe,
+            param_grid=parameter_grid,
+            cv=cv,
+            scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
+        )
+        cancer_fit = cancer_tune_grid.fit(features_train, labels_train)
+        accuracies_grid = (
+            pd.DataFrame(cancer_fit.cv_results_)[[
+                "param_kneighborsclassifier__n_neighbors",
+                "mean_test_score",
+                "std_test_score"
+            ]]
+            .rename(columns={"param_kneighborsclassifier__n_neighbors": "n_neighbors"})
+        )
 
-    cancer_fit = cancer_tune_grid.fit(
-        cancer_train.drop(columns=["class"]),
-        cancer_train["class"]
-    )
+    # choose the decision threshold and calibrate the conformal prediction sets on
+    # out-of-fold neighbour-vote fractions of the chosen k, so the test data stay unseen
+    best_n_neighbors = int(accuracies_grid.loc[accuracies_grid["mean_test_score"].idxmax(), "n_neighbors"])
+    classes = np.unique(labels_train)
+    if fold_cache:
+        validation_scores = out_of_fold_scores(folds, labels_train, best_n_neighbors, pos_label='Malignant')
+    else:
+        # the grid search keeps no predictions, so refit only the chosen k on the same 30 folds
+        validation_scores = cross_val_predict(
+            make_pipeline(cancer_preprocessor, KNeighborsClassifier(n_neighbors=best_n_neighbors)),
+            features_train, labels_train, cv=cv, method="predict_proba"
+        )[:, list(classes).index('Malignant')]
+    validation_curve = threshold_curve(validation_scores, labels_train, pos_label='Malignant', beta=2)
+    best_threshold = validation_curve.loc[validation_curve["fbeta"].idxmax()]
+    validation_probabilities = np.column_stack([
+        validation_scores if label == 'Malignant' else 1 - validation_scores for label in classes
+    ])
+    # raises when there are too few training rows for alpha, before any model file is written
+    quantile = conformal_quantile(validation_probabilities, labels_train, classes, alpha=alpha)
+    write_json({
+        "n_neighbors": best_n_neighbors,
+        "pos_label": "Malignant",
+        "threshold": best_threshold["threshold"],
+        "validation_precision": best_threshold["precision"],
+        "validation_recall": best_threshold["recall"],
+        "validation_f2": best_threshold["fbeta"],
+        "alpha": alpha,
+        "classes": classes.tolist(),
+        "quantile": quantile,
+        "n_validation": len(validation_scores)
+    }, pipeline_to, "operating_point.json")
 
     with open(os.path.join(pipeline_to, "cancer_pipeline.pickle"), 'wb') as f:
         pickle.dump(cancer_fit, f)
 
-    accuracies_grid = pd.DataFrame(cancer_fit.cv_results_)
+    # summarize the training features so incoming data can be checked for drift
+    training_sketch = make_feature_sketch(
+        {column: FEATURE_RANGES[column] for column in cancer_train.columns.drop("class")}
+    )
+    update_feature_sketch(training_sketch, cancer_train)
+    save_feature_sketch(training_sketch, os.path.join(pipeline_to, "training_feature_sketch.npz"))
 
     accuracies_grid = (
-        accuracies_grid[[
-            "param_kneighborsclassifier__n_neighbors",
-            "mean_test_score",
-            "std_test_score"
-        ]]
+        accuracies_grid
         .assign(
             sem_test_score=accuracies_grid["std_test_score"] / cv**(1/2),
             # `lambda` allows access to the chained dataframe so that we can use the newly created `sem_test_score` column 
             sem_test_score_lower=lambda df: df["mean_test_score"] - (df["sem_test_score"]/2),
             sem_test_score_upper=lambda df: df["mean_test_score"] + (df["sem_test_score"]/2)
         )
-        .rename(columns={"param_kneighborsclassifier__n_neighbors": "n_neighbors"})
         .drop(columns=["std_test_score"])
     )
 
@@ -117,5 +203,22 @@ def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, see
     plot = line_n_point + line_n_point.mark_circle(color='black') + error_bar
     plot.save(os.path.join(plot_to, "cancer_choose_k.png"), scale_factor=2.0)
 
+    if summary_to:
+        # small summary so the report doesn't have to unpickle the model
+        best = accuracies_grid.loc[accuracies_grid["mean_test_score"].idxmax()]
+        write_json({
+            "scoring": "F2 score (beta = 2)",
+            "cv": cv,
+            "n_train": len(labels_train),
+            "features": cancer_train.columns.drop("class").tolist(),
+            "best_n_neighbors": int(best["n_neighbors"]),
+            "best_mean_test_score": best["mean_test_score"],
+            "threshold": best_threshold["threshold"],
+            "threshold_validation_f2": best_threshold["fbeta"],
+            "conformal_quantile": quantile,
+            "grid": accuracies_grid[["n_neighbors", "mean_test_score", "sem_test_score"]].to_dict(orient="records")
+        }, summary_to, "tuning_summary.json")
+        write_csv(validation_curve.rename(columns={"fbeta": "f2"}), summary_to, "validation_threshold_curve.csv")
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+# monitor_drift.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_sketch import (
+    make_feature_sketch, update_feature_sketch, sketch_quantiles, save_feature_sketch, load_feature_sketch
+)
+from src.compare_feature_sketches import compare_feature_sketches
+from src.write_csv import write_csv
+
+
+@click.command()
+@click.option('--data', type=str, help="Path to CSV file of records to check, or '-' to read them from standard input")
+@click.option('--reference-sketch', type=str, help="Path to the training feature sketch written by the fit script")
+@click.option('--current-sketch', type=str,
+              help="Optional: path to a sketch from an earlier run to continue from; it is updated in place")
+@click.option('--results-to', type=str, help="Path to directory where the drift report will be written to")
+@click.option('--batch-size', type=int, default=100000, help="Number of records summarized per vectorized batch")
+@click.option('--psi-threshold', type=float, default=0.2,
+              help="PSI above which a feature is flagged as drifted (if its KS statistic is also significant)")
+@click.option('--max-out-of-range', type=float, default=0.01,
+              help="Fraction of out-of-range values above which a feature is flagged")
+def main(data, reference_sketch, current_sketch, results_to, batch_size, psi_threshold, max_out_of_range):
+    '''Summarizes a stream of records in constant memory with the same
+    per-feature bins and valid ranges as the training data, then reports
+    drift (PSI, KS, mean shift) and data-quality problems (missing and
+    out-of-range values) for each feature.'''
+    reference = load_feature_sketch(reference_sketch)
+    if current_sketch and os.path.exists(current_sketch):
+        current = load_feature_sketch(current_sketch)
+    else:
+        current = make_feature_sketch(
+            dict(zip(reference["columns"], zip(reference["low"], reference["high"]))),
+            n_bins=reference["histogram"].shape[1] - 2
+        )
+
+    records = pd.read_csv(
+        sys.stdin if data == '-' else data,
+        usecols=list(reference["columns"]),
+        dtype=np.float64,
+        chunksize=batch_size
+    )
+    for batch in records:
+        update_feature_sketch(current, batch)
+
+    drift = compare_feature_sketches(reference, current, psi_threshold=psi_threshold)
+    drift = drift.assign(
+        median_current=sketch_quantiles(current, [0.5])[0.5].to_numpy(),
+        out_of_range=drift["out_of_range_fraction"] > max_out_of_range
+    )
+    write_csv(drift, results_to, "drift_report.csv")
+    save_feature_sketch(current, current_sketch or os.path.join(results_to, "current_feature_sketch.npz"))
+
+    click.echo(drift[["feature", "psi", "ks", "ks_critical", "mean_shift", "out_of_range_fraction"]].to_string(index=False))
+    flagged = drift[drift["drifted"] | drift["out_of_range"]]
+    if not flagged.empty:
+        click.echo(f"Flagged features: {', '.join(flagged['feature'])}")
+
+
+if __name__ == '__main__':
+    main()
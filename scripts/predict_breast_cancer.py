@@ -0,0 +1,77 @@
+# predict_breast_cancer.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import json
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+from sklearn import set_config
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_csv import FEATURE_DTYPES
+from src.read_cancer_data import read_cancer_data
+from src.conformal_prediction import conformal_prediction_sets
+from src.write_csv import write_csv
+
+
+@click.command()
+@click.option('--data', type=str, help="Path to the records to classify (CSV or Parquet); a 'class' column is ignored")
+@click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
+@click.option('--pipeline-from', type=str, help="Path to the fit pipeline object")
+@click.option('--operating-point-from', type=str,
+              help="Optional: path to the decision threshold and conformal quantile written by the fit script; "
+                   "applies the threshold and adds prediction sets")
+@click.option('--threshold', type=float,
+              help="Optional: predict 'Malignant' when at least this fraction of the neighbours is malignant "
+                   "(default: the threshold of --operating-point-from, else the majority vote of the pipeline)")
+@click.option('--results-to', type=str, help="Path to directory where the predictions will be written to")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+@click.option('--transform-output', type=click.Choice(["pandas", "numpy"]), default="pandas",
+              help="Use 'numpy' for a pipeline fit with --transform-output=numpy; features are then passed by position")
+def main(data, columns_to_drop, pipeline_from, operating_point_from, threshold, results_to, dtype, transform_output):
+    '''Classifies new records with the fit pipeline and writes, for each record,
+    the fraction of malignant neighbours, the predicted class and, optionally,
+    its conformal prediction set.'''
+    set_config(transform_output="pandas" if transform_output == "pandas" else "default")
+
+    cancer = read_cancer_data(data, dtype=dtype, columns_to_drop=columns_to_drop)
+    with open(pipeline_from, 'rb') as f:
+        cancer_fit = pickle.load(f)
+
+    features = cancer.drop(columns=["class"], errors="ignore")
+    if transform_output == "numpy":
+        features = np.ascontiguousarray(features.to_numpy())
+
+    # every output below is read off this single neighbour query
+    probabilities = cancer_fit.predict_proba(features)
+    classes = cancer_fit.classes_
+    malignant_scores = probabilities[:, list(classes).index('Malignant')]
+    operating_point = None
+    if operating_point_from:
+        with open(operating_point_from) as f:
+            operating_point = json.load(f)
+        if operating_point["classes"] != list(classes):
+            raise ValueError("The operating point was chosen for different classes than the pipeline's.")
+        if threshold is None:
+            threshold = operating_point["threshold"]
+    if threshold is None:
+        predicted = classes[probabilities.argmax(axis=1)]
+    else:
+        predicted = np.where(malignant_scores >= threshold, 'Malignant', 'Benign')
+    predictions = pd.DataFrame({"malignant_probability": malignant_scores, "predicted": predicted})
+
+    if operating_point is not None:
+        prediction_sets = conformal_prediction_sets(probabilities, operating_point["quantile"], classes)
+        predictions["prediction_set"] = [
+            "|".join(classes[in_set]) for in_set in prediction_sets.to_numpy()
+        ]
+
+    write_csv(predictions, results_to, "predictions.csv")
+    click.echo(predictions["predicted"].value_counts().to_string())
+
+
+if __name__ == '__main__':
+    main()
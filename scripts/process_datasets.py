@@ -0,0 +1,52 @@
+# process_datasets.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_specs import DATASET_SPECS
+from src.read_cancer_csv import FEATURE_DTYPES
+from src.process_dataset import process_dataset
+from src.write_csv import write_csv
+
+
+@click.command()
+@click.option('--raw-dir', type=str, help="Path to directory the raw data files were extracted to")
+@click.option('--dataset', 'datasets', type=click.Choice(list(DATASET_SPECS)), multiple=True,
+              help="Data set to process; repeat to process several (default: all)")
+@click.option('--results-to', type=str, help="Path to directory where the results will be written to")
+@click.option('--n-jobs', type=int, default=os.cpu_count(), help="Number of worker processes")
+@click.option('--seed', type=int, default=522, help="Random seed for the train/test splits")
+@click.option('--cv', type=int, default=30, help="Number of cross-validation folds used to tune k")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+def main(raw_dir, datasets, results_to, n_jobs, seed, cv, dtype):
+    '''Reads, validates, splits, scales, tunes and evaluates a k-nn classifier
+    for several of the UCI breast cancer data sets in parallel, and writes the
+    test scores and the time spent on each stage of each data set.'''
+    datasets = list(datasets) or list(DATASET_SPECS)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(datasets))) as executor:
+        futures = [
+            executor.submit(process_dataset, name, raw_dir, seed=seed, cv=cv, dtype=dtype)
+            for name in datasets
+        ]
+        results = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - start
+
+    dataset_results = pd.DataFrame(results).assign(total_wall_seconds=wall_seconds)
+    write_csv(dataset_results, results_to, "dataset_results.csv")
+
+    click.echo(dataset_results[[
+        "dataset", "n_rows", "n_features", "n_neighbors", "accuracy", "f2",
+        "read_seconds", "validate_seconds", "model_seconds"
+    ]].to_string(index=False))
+    click.echo(f"{len(datasets)} data sets in {wall_seconds:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# refresh_model.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import os
+import pickle
+import sys
+import time
+import pandas as pd
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_data import read_cancer_data, read_columns_to_drop
+from src.validate_data import validate_data
+from src.knn_reference_state import (
+    build_reference_state, refresh_reference_state, score_reference_state, save_reference_state,
+    load_reference_state, reference_data, known_rows, reference_preprocessor
+)
+from src.write_json import write_json
+
+
+def read_labelled_data(filepath, columns_to_drop):
+    '''Reads and validates labelled rows, then leaves out the dropped columns.'''
+    cancer = read_cancer_data(filepath)
+    validate_data(cancer)
+    if columns_to_drop:
+        cancer = cancer.drop(columns=read_columns_to_drop(columns_to_drop))
+    return cancer
+
+
+@click.command()
+@click.option('--new-data', type=str, help="Optional: path to new labelled rows (CSV or Parquet) to add to the reference set")
+@click.option('--training-data', type=str,
+              help="Path to training data; only used to build the first version when --state-dir is empty")
+@click.option('--state-dir', type=str, help="Path to directory where the versioned reference state is kept")
+@click.option('--preprocessor', type=str, help="Path to preprocessor object (used with --pipeline-to)")
+@click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
+@click.option('--pipeline-to', type=str,
+              help="Optional: path to directory where a pipeline on all reference rows is written to; its scaler "
+                   "comes from the merged statistics, but indexing the rows for k-nn still costs O(n log n)")
+@click.option('--tolerance', type=float, default=0.05,
+              help="Largest shift of a feature's mean or standard deviation (in standard deviations) "
+                   "absorbed without rebuilding the neighbour lists")
+def main(new_data, training_data, state_dir, preprocessor, columns_to_drop, pipeline_to, tolerance):
+    '''Adds new labelled rows to the reference set of the k-nn classifier,
+    re-scores the k grid through the neighbour lists they affect, and writes
+    a new version of the reference state (a delta holding only the changed
+    rows, unless the state had to be rebuilt).'''
+    start = time.perf_counter()
+    try:
+        # loading replays the saved deltas and rebuilds the spatial index once
+        state, version = load_reference_state(state_dir)
+    except FileNotFoundError:
+        cancer_train = read_labelled_data(training_data, columns_to_drop)
+        state = build_reference_state(
+            cancer_train.drop(columns=["class"]), cancer_train["class"], cancer_train.columns.drop("class")
+        )
+        version = save_reference_state(state, state_dir)
+        click.echo(f"Built reference state version {version} from {len(cancer_train)} rows")
+    load_seconds = time.perf_counter() - start
+
+    n_added, n_known, rebuilt, refresh_seconds = 0, 0, False, 0.0
+    if new_data:
+        cancer_new = read_labelled_data(new_data, columns_to_drop)
+        if list(cancer_new.columns.drop("class")) != list(state["columns"]):
+            raise ValueError("New data must have the same feature columns as the reference state.")
+        # a row already in the reference set would become its own neighbour at distance zero
+        known = known_rows(state, cancer_new.drop(columns=["class"]))
+        n_known = int(known.sum())
+        cancer_new = cancer_new[~known]
+    if new_data and len(cancer_new) > 0:
+        start = time.perf_counter()
+        state, rebuilt = refresh_reference_state(
+            state, cancer_new.drop(columns=["class"]), cancer_new["class"], tolerance=tolerance
+        )
+        version = save_reference_state(state, state_dir)
+        refresh_seconds = time.perf_counter() - start
+        n_added = len(cancer_new)
+
+    # pick k from the leave-one-out scores
+    accuracies_grid = score_reference_state(state)
+    best = accuracies_grid.loc[accuracies_grid["test_score"].idxmax()]
+    features, labels = reference_data(state)
+    if pipeline_to:
+        # the scaler statistics are the merged ones, so only the k-nn index is built from all rows
+        cancer_preprocessor = reference_preprocessor(state, pickle.load(open(preprocessor, "rb")))
+        knn = KNeighborsClassifier(n_neighbors=int(best["n_neighbors"])).fit(
+            cancer_preprocessor.transform(pd.DataFrame(features, columns=state["columns"])), labels
+        )
+        cancer_fit = make_pipeline(cancer_preprocessor, knn)
+        with open(os.path.join(pipeline_to, f"cancer_pipeline_v{version:04d}.pickle"), 'wb') as f:
+            pickle.dump(cancer_fit, f)
+
+    write_json({
+        "version": version,
+        "scoring": "Leave-one-out F2 score (beta = 2)",
+        "n_reference": len(labels),
+        "n_added": n_added,
+        "n_known_dropped": n_known,
+        "full_rebuild": rebuilt,
+        "load_seconds": load_seconds,
+        "refresh_seconds": refresh_seconds,
+        "best_n_neighbors": int(best["n_neighbors"]),
+        "best_test_score": best["test_score"],
+        "grid": accuracies_grid.to_dict(orient="records")
+    }, state_dir, f"refresh_summary_v{version:04d}.json")
+
+    click.echo(f"Version {version}: {len(labels)} reference rows (+{n_added}"
+               f"{f', {n_known} already known dropped' if n_known else ''}"
+               f"{', full rebuild' if rebuilt else ''}) in {refresh_seconds:.3f} s; "
+               f"best n_neighbors = {int(best['n_neighbors'])} (F2 = {best['test_score']:.3f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# run_experiments.py
+# author: Tiffany Timbers
+# date: 2026-10-19
+
+import click
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_csv import FEATURE_DTYPES
+from src.read_cancer_data import read_columns_to_drop
+from src.dataset_specs import WDBC_SPEC
+from src.read_raw_dataset import read_raw_dataset
+from src.validate_data import validate_data
+from src.run_seed_experiment import run_seed_experiment
+from src.write_csv import write_csv
+
+# arrays shared with the parent process, set up once per worker by `attach_shared_arrays`
+shared_arrays = {}
+
+
+def share_array(array):
+    '''Copies `array` into a new shared memory block and returns the block
+    together with what a worker needs to map it: (name, shape, dtype).'''
+    memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+    return memory, (memory.name, array.shape, array.dtype.str)
+
+
+def attach_shared_arrays(features_spec, labels_spec):
+    '''Process pool initializer: maps the shared feature and label arrays
+    into the worker as read-only NumPy arrays without copying them.'''
+    for key, (name, shape, dtype) in [("features", features_spec), ("labels", labels_spec)]:
+        memory = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        array.flags.writeable = False
+        # keep the block referenced so it stays mapped for the lifetime of the worker
+        shared_arrays[key + "_memory"] = memory
+        shared_arrays[key] = array
+
+
+def run_seed(seed, cv, pos_label_code):
+    '''Runs split -> fit -> evaluate for one seed on the shared arrays and
+    records the run time and the peak memory of the worker process.'''
+    start = time.perf_counter()
+    result = run_seed_experiment(
+        shared_arrays["features"], shared_arrays["labels"], seed, cv=cv, pos_label=pos_label_code
+    )
+    result["seconds"] = time.perf_counter() - start
+    result["worker_pid"] = os.getpid()
+    # ru_maxrss is reported in kilobytes on Linux
+    result["worker_peak_memory_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+@click.command()
+@click.option('--raw-data', type=str, help="Path to raw data")
+@click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
+@click.option('--results-to', type=str, help="Path to directory where the experiment results will be written to")
+@click.option('--n-seeds', type=int, default=10, help="Number of seeds to run")
+@click.option('--first-seed', type=int, default=522, help="First seed; seeds first-seed, first-seed + 1, ... are run")
+@click.option('--n-jobs', type=int, default=os.cpu_count(), help="Number of worker processes")
+@click.option('--cv', type=int, default=30, help="Number of cross-validation folds used to tune k")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+def main(raw_data, columns_to_drop, results_to, n_seeds, first_seed, n_jobs, cv, dtype):
+    '''Runs the split, fit and evaluate steps of the analysis for several
+    random seeds in parallel and writes the test accuracy and F2 score of
+    each seed, summary statistics across seeds, and the peak memory of
+    each worker process.'''
+    start = time.perf_counter()
+
+    cancer = read_raw_dataset(WDBC_SPEC, raw_data, dtype=dtype)
+    validate_data(cancer, dtype=dtype)
+    # all raw columns are parsed here because validation covers every feature
+    if columns_to_drop:
+        cancer = cancer.drop(columns=read_columns_to_drop(columns_to_drop))
+
+    # parse and validate once, then share the arrays with all workers;
+    # labels are shared as integer codes (classes sort in the same order as their names)
+    features = np.ascontiguousarray(cancer.drop(columns=["class"]).to_numpy())
+    classes, label_codes = np.unique(cancer["class"].to_numpy(), return_inverse=True)
+    pos_label_code = int(np.flatnonzero(classes == "Malignant")[0])
+    features_memory, features_spec = share_array(features)
+    labels_memory, labels_spec = share_array(label_codes.astype(np.int8))
+
+    seeds = range(first_seed, first_seed + n_seeds)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=attach_shared_arrays,
+            initargs=(features_spec, labels_spec)
+        ) as executor:
+            results = list(executor.map(run_seed, seeds, [cv] * n_seeds, [pos_label_code] * n_seeds))
+    finally:
+        for memory in (features_memory, labels_memory):
+            memory.close()
+            memory.unlink()
+    wall_seconds = time.perf_counter() - start
+
+    seed_results = pd.DataFrame(results).sort_values("seed")
+    write_csv(seed_results, results_to, "experiment_seed_results.csv")
+
+    summary = (
+        seed_results[["n_neighbors", "cv_score", "accuracy", "f2", "seconds"]]
+        .agg(["mean", "std", "min", "max"])
+        .T
+        .rename_axis("metric")
+    )
+    write_csv(summary, results_to, "experiment_summary.csv", index=True)
+
+    workers = (
+        seed_results
+        .groupby("worker_pid")
+        .agg(
+            seeds_run=("seed", "count"),
+            busy_seconds=("seconds", "sum"),
+            peak_memory_mb=("worker_peak_memory_mb", "max")
+        )
+        .reset_index()
+        .assign(total_wall_seconds=wall_seconds)
+    )
+    write_csv(workers, results_to, "experiment_workers.csv")
+
+    click.echo(summary.to_string())
+    click.echo(f"{n_seeds} seeds on {len(workers)} workers in {wall_seconds:.1f} s "
+               f"(peak worker memory {workers['peak_memory_mb'].max():.0f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,63 +15,32 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.compose import make_column_transformer, make_column_selector
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.validate_data import validate_data
+from src.dataset_specs import WDBC_SPEC
+from src.read_raw_dataset import read_raw_dataset
+from src.read_cancer_csv import FEATURE_DTYPES
 from src.write_csv import write_csv
+from src.resolve_column_indices import resolve_column_indices
 
 @click.command()
 @click.option('--raw-data', type=str, help="Path to raw data")
 @click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
 @click.option('--preprocessor-to', type=str, help="Path to directory where the preprocessor object will be written to")
+@click.option('--dtype', type=click.Choice(FEATURE_DTYPES), help="Floating point dtype of the features", default="float64")
+@click.option('--transform-output', type=click.Choice(["pandas", "numpy"]), default="pandas",
+              help="Keep features as DataFrames (pandas) or as contiguous NumPy arrays (numpy) while scaling")
 @click.option('--seed', type=int, help="Random seed", default=123)
-def main(raw_data, data_to, preprocessor_to, seed):
+def main(raw_data, data_to, preprocessor_to, dtype, transform_output, seed):
     '''This script splits the raw data into train and test sets, 
     and then preprocesses the data to be used in exploratory data analysis.
     It also saves the preprocessor to be used in the model training script.'''
     np.random.seed(seed)
-    set_config(transform_output="pandas")
+    set_config(transform_output="pandas" if transform_output == "pandas" else "default")
 
-    colnames = [
-        "id",
-        "class",
-        "mean_radius",
-        "mean_texture",
-        "mean_perimeter", 
-        "mean_area",
-        "mean_smoothness",
-        "mean_compactness",
-        "mean_concavity",
-        "mean_concave_points",
-        "mean_symmetry",
-        "mean_fractal_dimension",
-        "se_radius",
-        "se_texture",
-        "se_perimeter", 
-        "se_area",
-        "se_smoothness",
-        "se_compactness",
-        "se_concavity",
-        "se_concave_points",
-        "se_symmetry",
-        "se_fractal_dimension",
-        "max_radius",
-        "max_texture",
-        "max_perimeter", 
-        "max_area",
-        "max_smoothness",
-        "max_compactness",
-        "max_concavity",
-        "max_concave_points",
-        "max_symmetry",
-        "max_fractal_dimension"
-    ]
+    # parse the features directly as `dtype`, skip the id column entirely,
+    # and re-label Class 'M' as 'Malignant', and Class 'B' as 'Benign'
+    cancer = read_raw_dataset(WDBC_SPEC, raw_data, dtype=dtype)
 
-    cancer = pd.read_csv(raw_data, names=colnames, header=None).drop(columns=['id'])
-    # re-label Class 'M' as 'Malignant', and Class 'B' as 'Benign'
-    cancer['class'] = cancer['class'].replace({
-        'M' : 'Malignant',
-        'B' : 'Benign'
-    })
-
-    validate_data(cancer)
+    validate_data(cancer, dtype=dtype)
     
     # create the split
     cancer_train, cancer_test = train_test_split(
@@ -88,9 +57,25 @@ def main(raw_data, data_to, preprocessor_to, seed):
     )
     pickle.dump(cancer_preprocessor, open(os.path.join(preprocessor_to, "cancer_preprocessor.pickle"), "wb"))
 
-    cancer_preprocessor.fit(cancer_train)
-    scaled_cancer_train = cancer_preprocessor.transform(cancer_train)
-    scaled_cancer_test = cancer_preprocessor.transform(cancer_test)
+    if transform_output == "numpy":
+        # scale contiguous feature arrays, selecting columns by precomputed position,
+        # and only put the column names back on when writing the results
+        feature_names = cancer_train.columns.drop("class")
+        cancer_preprocessor = resolve_column_indices(cancer_preprocessor, cancer_train[feature_names])
+        features_train = np.ascontiguousarray(cancer_train[feature_names].to_numpy())
+        features_test = np.ascontiguousarray(cancer_test[feature_names].to_numpy())
+
+        cancer_preprocessor.fit(features_train)
+        scaled_cancer_train = pd.DataFrame(
+            cancer_preprocessor.transform(features_train), columns=feature_names
+        ).assign(**{"class": cancer_train["class"].to_numpy()})
+        scaled_cancer_test = pd.DataFrame(
+            cancer_preprocessor.transform(features_test), columns=feature_names
+        ).assign(**{"class": cancer_test["class"].to_numpy()})
+    else:
+        cancer_preprocessor.fit(cancer_train)
+        scaled_cancer_train = cancer_preprocessor.transform(cancer_train)
+        scaled_cancer_test = cancer_preprocessor.transform(cancer_test)
 
     write_csv(scaled_cancer_train, data_to, "scaled_cancer_train.csv")
     write_csv(scaled_cancer_test, data_to, "scaled_cancer_test.csv")
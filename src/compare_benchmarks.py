@@ -0,0 +1,60 @@
+import pandas as pd
+
+
+def compare_benchmarks(baseline, current, tolerance=0.10, min_slowdown=0.05):
+    """
+    Compare the stage timings of two benchmark runs.
+
+    Both inputs are benchmark results as written by `scripts/benchmark.py`,
+    i.e. dictionaries with a 'timings' list whose entries have 'stage',
+    'n_rows' and 'seconds' keys (the fastest of several repeats). Only stages
+    and sizes present in both runs are compared. Timings of stages that take
+    milliseconds are mostly noise, so a stage only counts as a regression when
+    it is both relatively and absolutely slower than in the baseline.
+
+    Parameters
+    ----------
+    baseline : dict
+        The reference benchmark results.
+    current : dict
+        The benchmark results to compare against the baseline.
+    tolerance : float, optional
+        The relative slowdown allowed before a stage is flagged as a
+        regression. Default is 0.10 (10% slower).
+    min_slowdown : float, optional
+        The number of seconds a stage must also slow down by before it is
+        flagged as a regression. Default is 0.05.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per (stage, n_rows, dtype) with the baseline and current timings,
+        their ratio (current / baseline), and a boolean 'regression' column.
+
+    Raises
+    ------
+    ValueError
+        If `tolerance` or `min_slowdown` is negative, or the two runs have no timings in common.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must be non-negative.")
+    if min_slowdown < 0:
+        raise ValueError("min_slowdown must be non-negative.")
+
+    keys = ["stage", "n_rows", "dtype"]
+    baseline_timings = pd.DataFrame(baseline["timings"])[keys + ["seconds"]]
+    current_timings = pd.DataFrame(current["timings"])[keys + ["seconds"]]
+
+    comparison = baseline_timings.merge(
+        current_timings,
+        on=keys,
+        suffixes=("_baseline", "_current")
+    )
+    if comparison.empty:
+        raise ValueError("The benchmark runs have no stages and sizes in common.")
+
+    return comparison.assign(
+        ratio=comparison["seconds_current"] / comparison["seconds_baseline"],
+        regression=lambda df: (df["ratio"] > 1 + tolerance)
+        & (df["seconds_current"] - df["seconds_baseline"] > min_slowdown)
+    )
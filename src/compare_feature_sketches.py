@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+
+def compare_feature_sketches(reference, current, epsilon=1e-4, n_psi_bins=10, psi_threshold=0.2, ks_alpha=0.05):
+    """
+    Compare the feature distributions summarized by two feature sketches.
+
+    For each feature this reports the population stability index (PSI) and the
+    Kolmogorov-Smirnov (KS) statistic between the two histograms, the shift of
+    the mean in units of the reference standard deviation, and data-quality
+    measures of the current data: the fraction of missing values and of values
+    outside the valid range. The KS statistic is computed from the binned
+    cumulative distributions, so it is exact up to the bin width.
+
+    The PSI is computed on about `n_psi_bins` coarse bins, made by merging the
+    sketch's fine bins at the reference quantiles, so each holds roughly the same
+    share of the reference data. Sampling noise alone inflates the PSI by about
+    (bins - 1)(1/n_reference + 1/n_current), so the fine bins would flag
+    in-distribution samples of a few hundred rows. A feature is flagged as
+    drifted only when its PSI exceeds `psi_threshold` and its KS statistic also
+    exceeds the two-sample KS critical value for the two sample sizes.
+
+    Parameters
+    ----------
+    reference : dict
+        The sketch of the reference (training) data, from `make_feature_sketch`.
+    current : dict
+        The sketch of the data to check, built with the same features, ranges and bins.
+    epsilon : float, optional
+        Proportion used in place of empty bins when computing the PSI. Default is 1e-4.
+    n_psi_bins : int, optional
+        The number of reference-quantile bins the PSI is computed on. Default is 10.
+    psi_threshold : float, optional
+        The PSI above which a feature can be flagged as drifted. Default is 0.2.
+    ks_alpha : float, optional
+        The significance level of the KS critical value. Default is 0.05.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per feature with the columns 'n_current', 'mean_reference',
+        'mean_current', 'mean_shift', 'psi', 'ks', 'ks_critical', 'drifted',
+        'missing_fraction' and 'out_of_range_fraction'.
+
+    Raises
+    ------
+    ValueError
+        If the sketches do not have the same features, ranges and bins,
+        or the reference sketch is empty.
+    """
+    if (
+        not np.array_equal(reference["columns"], current["columns"])
+        or not np.array_equal(reference["low"], current["low"])
+        or not np.array_equal(reference["high"], current["high"])
+        or reference["histogram"].shape != current["histogram"].shape
+    ):
+        raise ValueError("Sketches must have the same features, ranges and bins.")
+    if (reference["count"] == 0).any():
+        raise ValueError("The reference sketch has features without observations.")
+
+    reference_proportion = reference["histogram"] / reference["count"][:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        current_proportion = current["histogram"] / current["count"][:, None]
+        reference_std = np.sqrt(reference["m2"] / reference["count"])
+        mean_shift = (current["mean"] - reference["mean"]) / reference_std
+
+    # merge the fine bins into coarse bins at the reference quantiles: each fine bin
+    # joins the coarse bin of the reference quantile at which it starts
+    start_proportion = np.cumsum(reference_proportion, axis=1) - reference_proportion
+    coarse_bin = np.minimum((start_proportion * n_psi_bins).astype(np.int64), n_psi_bins - 1)
+    features = np.arange(len(coarse_bin))[:, None]
+    coarse_reference = np.zeros((len(coarse_bin), n_psi_bins))
+    coarse_current = np.zeros((len(coarse_bin), n_psi_bins))
+    np.add.at(coarse_reference, (features, coarse_bin), reference_proportion)
+    np.add.at(coarse_current, (features, coarse_bin), current_proportion)
+    psi_reference = np.maximum(coarse_reference, epsilon)
+    psi_current = np.maximum(coarse_current, epsilon)
+    psi = ((psi_current - psi_reference) * np.log(psi_current / psi_reference)).sum(axis=1)
+    ks = np.abs(np.cumsum(current_proportion, axis=1) - np.cumsum(reference_proportion, axis=1)).max(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ks_critical = np.sqrt(-np.log(ks_alpha / 2) / 2) * np.sqrt(
+            (reference["count"] + current["count"]) / (reference["count"] * current["count"])
+        )
+
+    # features with no current observations cannot be compared
+    no_current = current["count"] == 0
+    psi[no_current] = np.nan
+    ks[no_current] = np.nan
+    ks_critical[no_current] = np.nan
+    mean_shift[no_current] = np.nan
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        missing_fraction = current["missing"] / current["n_rows"][0]
+        out_of_range_fraction = (current["histogram"][:, 0] + current["histogram"][:, -1]) / current["count"]
+
+    return pd.DataFrame({
+        "feature": current["columns"],
+        "n_current": current["count"],
+        "mean_reference": reference["mean"],
+        "mean_current": np.where(no_current, np.nan, current["mean"]),
+        "mean_shift": mean_shift,
+        "psi": psi,
+        "ks": ks,
+        "ks_critical": ks_critical,
+        "drifted": (psi > psi_threshold) & (ks > ks_critical),
+        "missing_fraction": missing_fraction,
+        "out_of_range_fraction": out_of_range_fraction
+    })
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def conformal_quantile(calibration_probabilities, calibration_labels, classes, alpha=0.1):
+    """
+    Calibrate split-conformal prediction sets on held-out labelled observations.
+
+    The nonconformity of an observation is one minus the probability the model
+    gives its true class. The returned quantile is the ceil((n + 1)(1 - alpha))-th
+    smallest of the n calibration nonconformity scores, read off a single sort;
+    prediction sets built with it (see `conformal_prediction_sets`) contain the
+    true class of a new exchangeable observation with probability at least
+    1 - alpha.
+
+    Parameters
+    ----------
+    calibration_probabilities : numpy.ndarray of shape (n_observations, n_classes)
+        Class probabilities of the calibration observations, e.g. from `predict_proba`.
+    calibration_labels : array-like of shape (n_observations,)
+        The true class label of each calibration observation.
+    classes : array-like of shape (n_classes,)
+        The class of each column of `calibration_probabilities` (e.g. `classes_`).
+    alpha : float, optional
+        The allowed miscoverage rate, between 0 and 1. Default is 0.1.
+
+    Returns
+    -------
+    float
+        The nonconformity quantile.
+
+    Raises
+    ------
+    ValueError
+        If `alpha` is not between 0 and 1, a label is not one of `classes`, or
+        there are fewer than 1 / alpha - 1 calibration observations, too few
+        for any finite quantile to reach the requested coverage.
+    """
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1.")
+    label_index = pd.Index(classes).get_indexer(np.asarray(calibration_labels))
+    if (label_index < 0).any():
+        raise ValueError(f"calibration_labels must be one of {list(classes)}")
+
+    n_observations = len(label_index)
+    nonconformity = 1 - np.asarray(calibration_probabilities)[np.arange(n_observations), label_index]
+    rank = int(np.ceil((n_observations + 1) * (1 - alpha)))
+    if rank > n_observations:
+        raise ValueError(
+            f"{n_observations} calibration observations are too few for alpha = {alpha}; "
+            f"at least {int(np.ceil(1 / alpha - 1))} are needed."
+        )
+    return float(np.sort(nonconformity)[rank - 1])
+
+
+def conformal_prediction_sets(probabilities, quantile, classes):
+    """
+    Build split-conformal prediction sets from class probabilities.
+
+    A class is in an observation's set when one minus its probability is at
+    most the calibrated `quantile`; all observations and classes are handled
+    in one vectorized comparison.
+
+    Parameters
+    ----------
+    probabilities : numpy.ndarray of shape (n_observations, n_classes)
+        Class probabilities, e.g. from `predict_proba`.
+    quantile : float
+        The nonconformity quantile from `conformal_quantile`.
+    classes : array-like of shape (n_classes,)
+        The class of each column of `probabilities`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One boolean column per class, True when the class is in the set.
+    """
+    return pd.DataFrame(1 - np.asarray(probabilities) <= quantile, columns=list(classes))
@@ -0,0 +1,106 @@
+"""
+Declarative descriptions of the Wisconsin breast cancer data sets in the UCI
+archive extracted by `download_data.py`.
+
+Each spec is a dict with the keys:
+
+- 'filename': the name of the raw data file in the download directory.
+- 'columns': the names of all columns of the headerless raw file, in file order.
+- 'ignore_columns': columns that are never parsed (identifiers, or outcomes that
+  are not used as features).
+- 'na_values': strings that mark missing values in the raw file.
+- 'labels': maps the raw class codes to the class names used in the analysis.
+- 'pos_label': the class name treated as positive when computing the F2 score.
+- 'feature_ranges': maps each feature column to its plausible (low, high) range;
+  every feature is parsed as a float and validated against its range.
+- 'unique_rows': whether duplicate rows indicate a data problem. The original
+  (1992) data set scores each feature on a 1-10 scale, so distinct samples
+  legitimately share all their values.
+"""
+
+# Plausible value ranges for each of the 30 WDBC measurement columns.
+FEATURE_RANGES = {
+    "mean_radius": (5, 45),
+    "mean_texture": (5, 50),
+    "mean_perimeter": (40, 260),
+    "mean_area": (140, 4300),
+    "mean_smoothness": (0, 1),
+    "mean_compactness": (0, 2),
+    "mean_concavity": (0, 2),
+    "mean_concave_points": (0, 1),
+    "mean_symmetry": (0, 1),
+    "mean_fractal_dimension": (0, 1),
+    "se_radius": (0, 3),
+    "se_texture": (0, 5),
+    "se_perimeter": (0, 22),
+    "se_area": (6, 550),
+    "se_smoothness": (0, 1),
+    "se_compactness": (0, 1),
+    "se_concavity": (0, 1),
+    "se_concave_points": (0, 1),
+    "se_symmetry": (0, 1),
+    "se_fractal_dimension": (0, 1),
+    "max_radius": (5, 40),
+    "max_texture": (5, 50),
+    "max_perimeter": (40, 260),
+    "max_area": (140, 4300),
+    "max_smoothness": (0, 1),
+    "max_compactness": (0, 2),
+    "max_concavity": (0, 2),
+    "max_concave_points": (0, 1),
+    "max_symmetry": (0, 1),
+    "max_fractal_dimension": (0, 1),
+}
+
+WDBC_SPEC = {
+    "filename": "wdbc.data",
+    "columns": ["id", "class", *FEATURE_RANGES],
+    "ignore_columns": ["id"],
+    "na_values": [],
+    "labels": {"M": "Malignant", "B": "Benign"},
+    "pos_label": "Malignant",
+    "feature_ranges": FEATURE_RANGES,
+    "unique_rows": True
+}
+
+# the prognostic data set has the same 30 nucleus features, the recurrence time
+# (not a feature: it is only known after the outcome) and two clinical features
+WPBC_SPEC = {
+    "filename": "wpbc.data",
+    "columns": ["id", "class", "time", *FEATURE_RANGES, "tumor_size", "lymph_node_status"],
+    "ignore_columns": ["id", "time"],
+    "na_values": ["?"],
+    "labels": {"R": "Recurrent", "N": "Nonrecurrent"},
+    "pos_label": "Recurrent",
+    "feature_ranges": {**FEATURE_RANGES, "tumor_size": (0, 20), "lymph_node_status": (0, 50)},
+    "unique_rows": True
+}
+
+BCW_FEATURES = [
+    "clump_thickness",
+    "uniformity_of_cell_size",
+    "uniformity_of_cell_shape",
+    "marginal_adhesion",
+    "single_epithelial_cell_size",
+    "bare_nuclei",
+    "bland_chromatin",
+    "normal_nucleoli",
+    "mitoses",
+]
+
+BCW_SPEC = {
+    "filename": "breast-cancer-wisconsin.data",
+    "columns": ["id", *BCW_FEATURES, "class"],
+    "ignore_columns": ["id"],
+    "na_values": ["?"],
+    "labels": {"2": "Benign", "4": "Malignant"},
+    "pos_label": "Malignant",
+    "feature_ranges": {feature: (1, 10) for feature in BCW_FEATURES},
+    "unique_rows": False
+}
+
+DATASET_SPECS = {
+    "wdbc": WDBC_SPEC,
+    "wpbc": WPBC_SPEC,
+    "bcw": BCW_SPEC,
+}
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+
+def make_feature_sketch(ranges, n_bins=64):
+    """
+    Create an empty constant-memory summary ("sketch") of a set of numeric features.
+
+    For every feature the sketch keeps the number of observed and missing values,
+    running mean and sum of squared deviations (for the variance), and counts in
+    `n_bins` equal-width bins spanning the feature's valid range plus one bin for
+    values below and one for values above it. Its size depends only on the number
+    of features and bins, never on the number of rows summarized.
+
+    Parameters
+    ----------
+    ranges : dict
+        Maps each feature name to its (low, high) valid range, e.g. `FEATURE_RANGES`
+        from `src.validate_data`.
+    n_bins : int, optional
+        The number of equal-width bins inside each range. Default is 64.
+
+    Returns
+    -------
+    dict
+        The empty sketch, to be filled with `update_feature_sketch`.
+
+    Raises
+    ------
+    ValueError
+        If `ranges` is empty, a range is not increasing, or `n_bins` is not positive.
+    """
+    if not ranges:
+        raise ValueError("ranges must contain at least one feature.")
+    if n_bins < 1:
+        raise ValueError("n_bins must be a positive integer.")
+    low, high = (np.array(bounds, dtype=float) for bounds in zip(*ranges.values()))
+    if (high <= low).any():
+        raise ValueError("Each range must have low < high.")
+
+    n_features = len(ranges)
+    return {
+        "columns": np.array(list(ranges)),
+        "low": low,
+        "high": high,
+        "n_rows": np.zeros(1, dtype=np.int64),
+        "count": np.zeros(n_features, dtype=np.int64),
+        "missing": np.zeros(n_features, dtype=np.int64),
+        "mean": np.zeros(n_features),
+        "m2": np.zeros(n_features),
+        # bin 0 holds values below the range and bin n_bins + 1 values above it
+        "histogram": np.zeros((n_features, n_bins + 2), dtype=np.int64)
+    }
+
+
+def update_feature_sketch(sketch, batch):
+    """
+    Add a batch of observations to a feature sketch, in place.
+
+    The whole batch is processed with vectorized NumPy operations; the running
+    moments are combined with the batch moments using the parallel (Chan et al.)
+    update, so the result does not depend on how the rows are split into batches.
+
+    Parameters
+    ----------
+    sketch : dict
+        A sketch created by `make_feature_sketch`.
+    batch : pandas.DataFrame
+        The new observations. It must contain every feature in the sketch;
+        other columns (e.g. 'class') are ignored.
+
+    Returns
+    -------
+    dict
+        The updated sketch (the same object that was passed in).
+
+    Raises
+    ------
+    TypeError
+        If `batch` is not a pandas DataFrame.
+    ValueError
+        If `batch` is missing a feature of the sketch.
+    """
+    if not isinstance(batch, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    missing_columns = set(sketch["columns"]).difference(batch.columns)
+    if missing_columns:
+        raise ValueError(f"Batch is missing columns: {sorted(missing_columns)}")
+
+    values = batch[list(sketch["columns"])].to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    batch_count = observed.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        batch_mean = np.where(batch_count > 0, np.nansum(values, axis=0) / batch_count, 0.0)
+    batch_m2 = np.nansum((values - batch_mean) ** 2, axis=0)
+    total = sketch["count"] + batch_count
+    delta = batch_mean - sketch["mean"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sketch["mean"] = np.where(total > 0, sketch["mean"] + delta * batch_count / total, 0.0)
+        sketch["m2"] = sketch["m2"] + batch_m2 + np.where(
+            total > 0, delta**2 * sketch["count"] * batch_count / total, 0.0
+        )
+    sketch["count"] = total
+    sketch["missing"] += len(values) - batch_count
+    sketch["n_rows"] += len(values)
+
+    n_bins = sketch["histogram"].shape[1] - 2
+    # clip far-out values first so they cannot overflow the integer bin index
+    position = np.clip((values - sketch["low"]) / (sketch["high"] - sketch["low"]), -1.0, 2.0)
+    with np.errstate(invalid="ignore"):
+        # missing values get an arbitrary bin here and are masked out below
+        bins = np.floor(position * n_bins).astype(np.int64, copy=False) + 1
+    # the upper bound itself belongs to the last bin inside the range
+    bins[position == 1] = n_bins
+    np.clip(bins, 0, n_bins + 1, out=bins)
+    flat_bins = (bins + np.arange(values.shape[1]) * (n_bins + 2))[observed]
+    sketch["histogram"] += np.bincount(flat_bins, minlength=sketch["histogram"].size).reshape(sketch["histogram"].shape)
+    return sketch
+
+
+def sketch_quantiles(sketch, quantiles):
+    """
+    Estimate quantiles of each feature from a sketch's histogram.
+
+    Values are assumed to be spread uniformly within each bin; values outside the
+    valid range are placed at its bounds.
+
+    Parameters
+    ----------
+    sketch : dict
+        A sketch created by `make_feature_sketch`.
+    quantiles : list of float
+        The quantiles to estimate, each between 0 and 1.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per feature and one column per quantile (NaN for features without observations).
+    """
+    n_bins = sketch["histogram"].shape[1] - 2
+    estimates = np.full((len(sketch["columns"]), len(quantiles)), np.nan)
+    for i, (low, high) in enumerate(zip(sketch["low"], sketch["high"])):
+        counts = sketch["histogram"][i]
+        if counts.sum() == 0:
+            continue
+        # cumulative fraction at the upper edge of each bin; the outer bins have zero width
+        edges = np.concatenate([[low], np.linspace(low, high, n_bins + 1), [high]])
+        cumulative = np.concatenate([[0.0], np.cumsum(counts) / counts.sum()])
+        estimates[i] = np.interp(quantiles, cumulative, edges)
+    return pd.DataFrame(estimates, index=pd.Index(sketch["columns"], name="feature"), columns=quantiles)
+
+
+def save_feature_sketch(sketch, filepath):
+    """
+    Save a feature sketch to a '.npz' file.
+
+    Parameters
+    ----------
+    sketch : dict
+        A sketch created by `make_feature_sketch`.
+    filepath : str
+        Path of the file to write (must end with '.npz').
+
+    Raises
+    ------
+    ValueError
+        If the filename does not end with '.npz'.
+    """
+    if not filepath.endswith(".npz"):
+        raise ValueError("Filename must end with '.npz'")
+    np.savez(filepath, **sketch)
+
+
+def load_feature_sketch(filepath):
+    """
+    Load a feature sketch saved with `save_feature_sketch`.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the '.npz' file.
+
+    Returns
+    -------
+    dict
+        The sketch.
+    """
+    with np.load(filepath) as saved:
+        return {name: saved[name] for name in saved.files}
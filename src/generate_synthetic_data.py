@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from src.validate_data import FEATURE_RANGES
+
+
+def generate_synthetic_data(n_rows, seed=123, malignant_fraction=0.37):
+    """
+    Generate a synthetic data set with the same schema as the processed WDBC data.
+
+    Each row gets a 'class' label and one value for each of the 30 measurement
+    columns. Values are drawn inside the ranges enforced by `validate_data`, so
+    the result passes validation. A shared latent "severity" score is shifted
+    upwards for malignant rows, which makes the features correlated with each
+    other and with the label, roughly like the real data.
+
+    Parameters
+    ----------
+    n_rows : int
+        The number of rows (observations) to generate.
+    seed : int, optional
+        Seed for the random number generator. Default is 123.
+    malignant_fraction : float, optional
+        The expected proportion of 'Malignant' rows. Default is 0.37, which
+        matches the WDBC data set.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame with a 'class' column followed by the 30 float64
+        measurement columns, in the order used by `validate_data`.
+
+    Raises
+    ------
+    ValueError
+        If `n_rows` is not positive, or `malignant_fraction` is not between 0 and 1.
+    """
+    if n_rows < 1:
+        raise ValueError("n_rows must be a positive integer.")
+    if not 0 <= malignant_fraction <= 1:
+        raise ValueError("malignant_fraction must be between 0 and 1.")
+
+    rng = np.random.default_rng(seed)
+    malignant = rng.random(n_rows) < malignant_fraction
+    severity = rng.beta(2, 5, n_rows) + 0.35 * malignant
+
+    features = {}
+    for column, (low, high) in FEATURE_RANGES.items():
+        # mix the shared severity with per-feature noise and squeeze into [0, 1]
+        position = (0.5 * severity + 0.5 * rng.beta(2, 5, n_rows)) / 1.175
+        features[column] = low + (high - low) * position
+
+    return pd.DataFrame({
+        "class": np.where(malignant, "Malignant", "Benign"),
+        **features
+    })
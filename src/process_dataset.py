@@ -0,0 +1,82 @@
+import os
+import time
+import numpy as np
+from src.dataset_specs import DATASET_SPECS
+from src.read_raw_dataset import read_raw_dataset
+from src.validate_data import validate_data
+from src.run_seed_experiment import run_seed_experiment
+
+
+def process_dataset(name, raw_dir, seed=522, cv=30, n_neighbors=range(1, 100, 3), beta=2,
+                    train_size=0.70, dtype="float64"):
+    """
+    Run the read, validate, split, scale, tune and evaluate steps for one data set.
+
+    The data set is read and validated as described by its spec in
+    `src.dataset_specs`; rows with missing feature values are then left out
+    (k-nearest neighbours cannot use them) and the remaining rows go through
+    `run_seed_experiment` with the spec's positive class.
+
+    Parameters
+    ----------
+    name : str
+        The key of the data set in `DATASET_SPECS`, e.g. 'wdbc'.
+    raw_dir : str
+        Path to the directory the raw data files were extracted to.
+    seed : int, optional
+        Random seed for the train/test split. Default is 522.
+    cv : int, optional
+        The number of cross-validation folds used to tune k. Default is 30.
+    n_neighbors : iterable of int, optional
+        The values of k to try. Default is range(1, 100, 3).
+    beta : float, optional
+        The beta of the F-beta score. Default is 2.
+    train_size : float, optional
+        The proportion of observations in the training set. Default is 0.70.
+    dtype : str, optional
+        The floating point dtype of the features. Default is 'float64'.
+
+    Returns
+    -------
+    dict
+        The data set name, its number of rows, incomplete rows and features, the
+        results of `run_seed_experiment`, and the seconds spent reading, validating
+        and modelling (split, scale, tune, fit and evaluate) the data set.
+
+    Raises
+    ------
+    ValueError
+        If `name` is not a known data set.
+    """
+    if name not in DATASET_SPECS:
+        raise ValueError(f"name must be one of {list(DATASET_SPECS)}")
+    spec = DATASET_SPECS[name]
+
+    start = time.perf_counter()
+    cancer = read_raw_dataset(spec, os.path.join(raw_dir, spec["filename"]), dtype=dtype)
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validate_data(cancer, dtype=dtype, spec=spec)
+    validate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    complete = cancer.dropna()
+    features = np.ascontiguousarray(complete[list(spec["feature_ranges"])].to_numpy())
+    result = run_seed_experiment(
+        features, complete["class"].to_numpy(), seed, cv=cv, n_neighbors=n_neighbors,
+        pos_label=spec["pos_label"], beta=beta, train_size=train_size
+    )
+    model_seconds = time.perf_counter() - start
+
+    return {
+        "dataset": name,
+        "n_rows": len(cancer),
+        "n_incomplete_rows": len(cancer) - len(complete),
+        "n_features": features.shape[1],
+        "pos_label": spec["pos_label"],
+        **result,
+        "read_seconds": read_seconds,
+        "validate_seconds": validate_seconds,
+        "model_seconds": model_seconds
+    }
@@ -0,0 +1,40 @@
+from collections import defaultdict
+import pandas as pd
+
+FEATURE_DTYPES = ["float64", "float32"]
+
+
+def read_cancer_csv(filepath, dtype="float64", **kwargs):
+    """
+    Read a CSV file of cancer data, parsing the measurement columns directly as `dtype`.
+
+    The 'class' column is read as strings and every other column as `dtype`.
+    Parsing straight into the requested dtype avoids first materializing
+    float64 columns and then copying them into a downcast DataFrame.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the CSV file.
+    dtype : str, optional
+        The floating point dtype of the measurement columns, one of
+        'float64' or 'float32'. Default is 'float64'.
+    **kwargs
+        Additional keyword arguments passed on to `pandas.read_csv`
+        (e.g., `names`, `header` or `usecols`).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data read from the CSV file.
+
+    Raises
+    ------
+    ValueError
+        If `dtype` is not one of the supported floating point dtypes.
+    """
+    if dtype not in FEATURE_DTYPES:
+        raise ValueError(f"dtype must be one of {FEATURE_DTYPES}")
+
+    column_dtypes = defaultdict(lambda: dtype, {"class": str})
+    return pd.read_csv(filepath, dtype=column_dtypes, **kwargs)
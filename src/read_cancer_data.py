@@ -0,0 +1,77 @@
+import os
+import pandas as pd
+from src.read_cancer_csv import read_cancer_csv, FEATURE_DTYPES
+
+
+def read_columns_to_drop(filepath):
+    """
+    Read the list of feature columns to leave out of the model.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a CSV file with a 'feats_to_drop' column naming one feature per row.
+
+    Returns
+    -------
+    list of str
+        The names of the columns to drop.
+    """
+    return pd.read_csv(filepath).feats_to_drop.tolist()
+
+
+def read_cancer_data(filepath, dtype="float64", columns_to_drop=None):
+    """
+    Read cancer data from a CSV or Parquet file, skipping the dropped columns while parsing.
+
+    The columns listed in `columns_to_drop` are never parsed or allocated: CSV files
+    are read with `usecols`, and Parquet files are read with a column projection, so
+    memory and parsing time scale with the kept columns only. The 'class' column is
+    read as strings and every other column as `dtype`.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a '.csv' or '.parquet' file with a header row.
+    dtype : str, optional
+        The floating point dtype of the measurement columns, one of 'float64' or
+        'float32'. Default is 'float64'.
+    columns_to_drop : str or list of str, optional
+        The columns to leave out, or the path to a CSV file listing them
+        (see `read_columns_to_drop`). Default is None (read all columns).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data with only the kept columns, in file order.
+
+    Raises
+    ------
+    ValueError
+        If `dtype` is not supported, the file is neither CSV nor Parquet,
+        or a column to drop is not in the file.
+    """
+    if dtype not in FEATURE_DTYPES:
+        raise ValueError(f"dtype must be one of {FEATURE_DTYPES}")
+    if isinstance(columns_to_drop, str):
+        columns_to_drop = read_columns_to_drop(columns_to_drop)
+    columns_to_drop = set(columns_to_drop or [])
+
+    extension = os.path.splitext(filepath)[1]
+    if extension == ".csv":
+        columns = pd.read_csv(filepath, nrows=0).columns
+    elif extension == ".parquet":
+        import pyarrow.parquet
+        columns = pd.Index(pyarrow.parquet.read_schema(filepath).names)
+    else:
+        raise ValueError("Filename must end with '.csv' or '.parquet'")
+
+    missing = columns_to_drop.difference(columns)
+    if missing:
+        raise ValueError(f"Columns to drop not found in {filepath}: {sorted(missing)}")
+    kept_columns = [column for column in columns if column not in columns_to_drop]
+
+    if extension == ".csv":
+        return read_cancer_csv(filepath, dtype=dtype, usecols=kept_columns)
+    cancer = pd.read_parquet(filepath, columns=kept_columns)
+    return cancer.astype({column: dtype for column in kept_columns if column != "class"}, copy=False)
@@ -0,0 +1,34 @@
+from src.read_cancer_csv import read_cancer_csv
+
+
+def read_raw_dataset(spec, filepath, dtype="float64"):
+    """
+    Read a raw UCI breast cancer data file as described by a dataset spec.
+
+    The headerless file is parsed with the spec's column names, skipping its
+    ignored columns and treating its missing value markers as NaN. The features
+    are parsed directly as `dtype` and the class codes are replaced by the
+    spec's class names.
+
+    Parameters
+    ----------
+    spec : dict
+        A dataset spec from `src.dataset_specs`.
+    filepath : str
+        Path to the raw data file.
+    dtype : str, optional
+        The floating point dtype of the feature columns, one of 'float64' or
+        'float32'. Default is 'float64'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'class' column and the feature columns, in file order.
+    """
+    cancer = read_cancer_csv(
+        filepath, dtype=dtype, names=spec["columns"], header=None,
+        usecols=lambda column: column not in spec["ignore_columns"],
+        na_values=spec["na_values"]
+    )
+    cancer["class"] = cancer["class"].replace(spec["labels"])
+    return cancer
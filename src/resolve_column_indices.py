@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+
+
+def resolve_column_indices(column_transformer, dataframe):
+    """
+    Return an unfitted copy of a ColumnTransformer that selects its columns by integer position.
+
+    Column selectors such as `make_column_selector(dtype_include='number')`,
+    column names, and slices of column names are resolved once against the
+    columns of `dataframe`. The returned transformer can then be fit on and
+    applied to a NumPy array whose columns are in the same order as
+    `dataframe`, without inspecting column names or dtypes at runtime.
+
+    Parameters
+    ----------
+    column_transformer : sklearn.compose.ColumnTransformer
+        The (fitted or unfitted) column transformer whose column specifications will be resolved.
+    dataframe : pandas.DataFrame
+        A DataFrame with the columns, in order, of the data the transformer will be applied to.
+        Only its columns and dtypes are used, so it may have no rows.
+
+    Returns
+    -------
+    sklearn.compose.ColumnTransformer
+        An unfitted clone of `column_transformer` where every column specification is a list of
+        integer positions.
+
+    Raises
+    ------
+    TypeError
+        If `column_transformer` is not a ColumnTransformer or `dataframe` is not a pandas DataFrame.
+    ValueError
+        If a column named by the transformer is not in `dataframe`.
+    """
+    if not isinstance(column_transformer, ColumnTransformer):
+        raise TypeError("column_transformer must be a ColumnTransformer")
+    if not isinstance(dataframe, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+
+    resolved = clone(column_transformer)
+    resolved.transformers = [
+        (name, transformer, _column_positions(columns, dataframe))
+        for name, transformer, columns in resolved.transformers
+    ]
+    return resolved
+
+
+def _column_positions(columns, dataframe):
+    if callable(columns):
+        columns = columns(dataframe)
+    if isinstance(columns, str):
+        columns = [columns]
+    if isinstance(columns, slice) and (isinstance(columns.start, str) or isinstance(columns.stop, str)):
+        columns = dataframe.columns[dataframe.columns.slice_indexer(columns.start, columns.stop, columns.step)]
+
+    positions = np.arange(dataframe.shape[1])
+    if isinstance(columns, slice):
+        return positions[columns].tolist()
+
+    columns = np.asarray(columns)
+    if columns.size == 0:
+        return []
+    if columns.dtype.kind in "biu":
+        # boolean masks and integer positions are already positional
+        return positions[columns].tolist()
+
+    indexer = dataframe.columns.get_indexer(columns)
+    missing = columns[indexer == -1]
+    if len(missing) > 0:
+        raise ValueError(f"Columns not found in the DataFrame: {missing.tolist()}")
+    return indexer.tolist()
@@ -0,0 +1,71 @@
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.metrics import accuracy_score, fbeta_score
+from src.scaled_folds import scaled_folds
+from src.tune_n_neighbors import tune_n_neighbors
+
+
+def run_seed_experiment(features, labels, seed, cv=30, n_neighbors=range(1, 100, 3),
+                        pos_label="Malignant", beta=2, train_size=0.70):
+    """
+    Run the split, fit and evaluate steps of the analysis for one random seed.
+
+    The data are split into stratified train and test sets with `seed` (giving the
+    same split as `split_n_preprocess.py --seed`), k is tuned by `cv`-fold cross
+    validation on the training set, and a standardized k-nearest neighbours
+    classifier with the best k is evaluated on the test set.
+
+    Parameters
+    ----------
+    features : numpy.ndarray
+        A 2D array of numeric features (one row per observation).
+    labels : numpy.ndarray
+        The class label of each observation.
+    seed : int
+        Random seed for the train/test split.
+    cv : int, optional
+        The number of cross-validation folds used to tune k. Default is 30.
+    n_neighbors : iterable of int, optional
+        The values of k to try. Default is range(1, 100, 3).
+    pos_label : str, optional
+        The positive class used to compute the F-beta score. Default is 'Malignant'.
+    beta : float, optional
+        The beta of the F-beta score. Default is 2.
+    train_size : float, optional
+        The proportion of observations in the training set. Default is 0.70.
+
+    Returns
+    -------
+    dict
+        The seed, the chosen k ('n_neighbors'), its mean cross-validation score
+        ('cv_score'), and the test set 'accuracy' and 'f2' score.
+    """
+    train_index, test_index = train_test_split(
+        np.arange(len(labels)), train_size=train_size, stratify=labels, random_state=seed
+    )
+    features_train, labels_train = features[train_index], labels[train_index]
+
+    tuned = tune_n_neighbors(
+        scaled_folds(features_train, labels_train, cv=cv),
+        labels_train,
+        n_neighbors,
+        pos_label=pos_label,
+        beta=beta
+    )
+    best = tuned.loc[tuned["mean_test_score"].idxmax()]
+
+    cancer_fit = make_pipeline(
+        StandardScaler(), KNeighborsClassifier(n_neighbors=int(best["n_neighbors"]))
+    ).fit(features_train, labels_train)
+    predicted = cancer_fit.predict(features[test_index])
+
+    return {
+        "seed": seed,
+        "n_neighbors": int(best["n_neighbors"]),
+        "cv_score": best["mean_test_score"],
+        "accuracy": accuracy_score(labels[test_index], predicted),
+        "f2": fbeta_score(labels[test_index], predicted, beta=beta, pos_label=pos_label)
+    }
@@ -0,0 +1,188 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+# bump when the layout of the cached files changes so stale entries are never read
+CACHE_FORMAT_VERSION = 3
+
+
+def scaled_folds(features, labels, cv=30, seed=None, cache_dir=None, max_entries=8, preprocessor=None):
+    """
+    Split training data into stratified cross-validation folds and preprocess each fold.
+
+    For every fold a fresh clone of `preprocessor` is fit on the training part
+    only and applied to both the training and the validation part, exactly as the
+    preprocessor inside a cross-validated pipeline would. When `cache_dir` is
+    given, the fold indices, the preprocessed fold matrices and the per-fold
+    scaler statistics are stored there, keyed by a hash of the data, `cv`, `seed`
+    and the preprocessor's parameters, and reused by later calls with the same
+    inputs. Callable column selectors of a ColumnTransformer are resolved to
+    positions first, so the key is the same in every process. Only the
+    `max_entries` most recently used cache files are kept.
+
+    Parameters
+    ----------
+    features : numpy.ndarray
+        A 2D array of numeric features (one row per observation).
+    labels : array-like
+        The class label of each observation.
+    cv : int, optional
+        The number of stratified folds. Default is 30.
+    seed : int, optional
+        Seed used to shuffle the observations before splitting. With the default
+        (None) the data are not shuffled, which gives the same folds as passing
+        an integer `cv` to GridSearchCV.
+    cache_dir : str, optional
+        Path to the directory where folds are cached. Default is None (no caching).
+    max_entries : int, optional
+        The maximum number of cached fold sets kept in `cache_dir`. Default is 8.
+    preprocessor : sklearn transformer, optional
+        The (unfitted) preprocessor of the pipeline being tuned. It must accept
+        NumPy arrays, so a ColumnTransformer has to select its columns by position
+        (see `resolve_column_indices`). Default is None (a StandardScaler).
+
+    Returns
+    -------
+    list of dict
+        One dictionary per fold with the keys 'train_index', 'test_index',
+        'scaled_train' and 'scaled_test'. When the preprocessor is or contains
+        a StandardScaler, the fold also has 'mean' and 'scale', the fitted
+        scaler's statistics per input column (NaN for columns it does not scale).
+
+    Raises
+    ------
+    TypeError
+        If `features` is not a 2D NumPy array.
+    ValueError
+        If `features` and `labels` have different numbers of rows, `max_entries`
+        is not positive, or a column selector of the preprocessor cannot be
+        applied to a NumPy array.
+    FileNotFoundError
+        If `cache_dir` is given but does not exist.
+    """
+    if not isinstance(features, np.ndarray) or features.ndim != 2:
+        raise TypeError("features must be a 2D NumPy array")
+    labels = np.asarray(labels)
+    if len(labels) != features.shape[0]:
+        raise ValueError("features and labels must have the same number of rows.")
+    if max_entries < 1:
+        raise ValueError("max_entries must be a positive integer.")
+    if cache_dir is not None and not os.path.isdir(cache_dir):
+        raise FileNotFoundError(f"Directory {cache_dir} does not exist.")
+    preprocessor = StandardScaler() if preprocessor is None else _resolve_selectors(preprocessor, features)
+
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, _cache_key(features, labels, cv, seed, preprocessor) + ".npz")
+        if os.path.exists(cache_path):
+            # mark as recently used so eviction removes other entries first
+            os.utime(cache_path)
+            return _load_folds(cache_path)
+
+    folds = []
+    splitter = StratifiedKFold(n_splits=cv, shuffle=seed is not None, random_state=seed)
+    for train_index, test_index in splitter.split(features, labels):
+        # plain arrays regardless of the global `transform_output` setting
+        fold_preprocessor = clone(preprocessor).set_output(transform="default")
+        fold = {
+            "train_index": train_index,
+            "test_index": test_index,
+            "scaled_train": np.asarray(fold_preprocessor.fit_transform(features[train_index])),
+            "scaled_test": np.asarray(fold_preprocessor.transform(features[test_index]))
+        }
+        fold.update(_scaler_statistics(fold_preprocessor, features.shape[1]))
+        folds.append(fold)
+
+    if cache_dir is not None:
+        _save_folds(folds, cache_path)
+        _evict(cache_dir, max_entries)
+    return folds
+
+
+def _resolve_selectors(preprocessor, features):
+    # a callable selector's repr holds a memory address, so resolve it to positions
+    # the way ColumnTransformer would before it becomes part of the cache key
+    if not isinstance(preprocessor, ColumnTransformer):
+        return preprocessor
+    resolved = clone(preprocessor)
+    transformers = []
+    for name, transformer, columns in resolved.transformers:
+        if callable(columns):
+            try:
+                columns = columns(features)
+            except Exception as error:
+                raise ValueError(
+                    f"The column selector of '{name}' cannot be applied to a NumPy array; "
+                    "select the columns by position (see resolve_column_indices)."
+                ) from error
+        transformers.append((name, transformer, columns))
+    resolved.transformers = transformers
+    return resolved
+
+
+def _scaler_statistics(fitted, n_features):
+    # mean and scale per input column of the fitted StandardScaler(s), if any
+    if isinstance(fitted, StandardScaler):
+        scalers = [(fitted, np.arange(n_features))]
+    elif isinstance(fitted, ColumnTransformer):
+        scalers = [
+            (transformer, np.arange(n_features)[columns])
+            for _, transformer, columns in fitted.transformers_
+            if isinstance(transformer, StandardScaler)
+        ]
+    else:
+        scalers = []
+    if not scalers:
+        return {}
+    mean, scale = np.full(n_features, np.nan), np.full(n_features, np.nan)
+    for scaler, positions in scalers:
+        # StandardScaler leaves these as None when it does not center or scale
+        mean[positions] = scaler.mean_ if scaler.mean_ is not None else 0.0
+        scale[positions] = scaler.scale_ if scaler.scale_ is not None else 1.0
+    return {"mean": mean, "scale": scale}
+
+
+def _cache_key(features, labels, cv, seed, preprocessor):
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT_VERSION}|{features.dtype.str}|{features.shape}|{cv}|{seed}".encode())
+    # any change to the preprocessor's type or parameters gives a new entry
+    digest.update(f"{type(preprocessor).__name__}|{sorted(preprocessor.get_params(deep=True).items())}".encode())
+    digest.update(np.ascontiguousarray(features).tobytes())
+    digest.update("\x00".join(labels.astype(str)).encode())
+    return digest.hexdigest()
+
+
+def _save_folds(folds, cache_path):
+    arrays = {
+        f"{i}_{name}": value
+        for i, fold in enumerate(folds)
+        for name, value in fold.items()
+    }
+    # write to a temporary file first so a crash never leaves a truncated entry behind
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+    with os.fdopen(file_descriptor, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temporary_path, cache_path)
+
+
+def _load_folds(cache_path):
+    with np.load(cache_path) as cached:
+        folds = {}
+        for key in cached.files:
+            i, name = key.split("_", 1)
+            folds.setdefault(int(i), {})[name] = cached[key]
+        return [folds[i] for i in sorted(folds)]
+
+
+def _evict(cache_dir, max_entries):
+    entries = sorted(
+        (os.path.join(cache_dir, filename) for filename in os.listdir(cache_dir) if filename.endswith(".npz")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    for stale_entry in entries[max_entries:]:
+        os.remove(stale_entry)
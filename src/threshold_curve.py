@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from src.tune_n_neighbors import _fbeta
+
+
+def threshold_curve(scores, labels, pos_label="Malignant", beta=2):
+    """
+    Compute precision, recall and the F-beta score for every decision threshold at once.
+
+    An observation is predicted positive when its score is at least the threshold.
+    The scores are sorted once and the true and false positives at every distinct
+    score are read off cumulative counts, so the whole curve costs one sort
+    rather than one prediction per threshold.
+
+    Parameters
+    ----------
+    scores : array-like
+        The score of each observation, e.g. the fraction of its neighbours that
+        belong to `pos_label` (the `pos_label` column of `predict_proba`).
+    labels : array-like
+        The true class label of each observation.
+    pos_label : str, optional
+        The positive class. Default is 'Malignant'.
+    beta : float, optional
+        The beta of the F-beta score. Default is 2.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per distinct score, from the highest to the lowest, with the
+        columns 'threshold', 'n_predicted_positive', 'precision', 'recall'
+        and 'fbeta'.
+
+    Raises
+    ------
+    ValueError
+        If `scores` and `labels` differ in length, or there are no positive observations.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    positive = np.asarray(labels) == pos_label
+    if len(scores) != len(positive):
+        raise ValueError("scores and labels must have the same length.")
+    if not positive.any():
+        raise ValueError("labels must contain at least one observation of pos_label.")
+
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    true_positives = np.cumsum(positive[order])
+    false_positives = np.cumsum(~positive[order])
+    # the last observation of each run of equal scores is the last one predicted positive at that threshold
+    last = np.flatnonzero(np.diff(sorted_scores, append=-np.inf) != 0)
+    true_positives, false_positives = true_positives[last], false_positives[last]
+    false_negatives = positive.sum() - true_positives
+
+    return pd.DataFrame({
+        "threshold": sorted_scores[last],
+        "n_predicted_positive": true_positives + false_positives,
+        "precision": true_positives / (true_positives + false_positives),
+        "recall": true_positives / positive.sum(),
+        "fbeta": _fbeta(true_positives, false_positives, false_negatives, beta)
+    })
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+
+def tune_n_neighbors(folds, labels, n_neighbors, pos_label="Malignant", beta=2):
+    """
+    Cross-validate a k-nearest neighbours classifier for several values of k at once.
+
+    For each fold, the neighbours of every validation observation are looked up
+    once, for the largest k in the grid. The prediction for every smaller k is
+    then read off the cumulative count of positive-class neighbours, so the cost
+    of a fold does not grow with the number of k values. Ties are broken like
+    KNeighborsClassifier, in favour of the class that sorts first.
+
+    Parameters
+    ----------
+    folds : list of dict
+        Scaled cross-validation folds as returned by `scaled_folds`.
+    labels : array-like
+        The class label of each observation, indexed by the fold indices.
+    n_neighbors : iterable of int
+        The values of k to evaluate.
+    pos_label : str, optional
+        The positive class used to compute the F-beta score. Default is 'Malignant'.
+    beta : float, optional
+        The beta of the F-beta score. Default is 2.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per value of k with the columns 'n_neighbors', 'mean_test_score'
+        and 'std_test_score', the mean and standard deviation of the F-beta score
+        across folds (as in GridSearchCV's `cv_results_`).
+
+    Raises
+    ------
+    ValueError
+        If `labels` does not contain exactly two classes including `pos_label`,
+        or a value of k is not positive.
+    """
+    labels = np.asarray(labels)
+    classes = np.unique(labels)
+    if len(classes) != 2 or pos_label not in classes:
+        raise ValueError("labels must contain exactly two classes, one of which is pos_label.")
+    n_neighbors = np.asarray(list(n_neighbors))
+    if (n_neighbors < 1).any():
+        raise ValueError("n_neighbors must be positive integers.")
+    # KNeighborsClassifier breaks ties in favour of the class that sorts first
+    ties_are_positive = pos_label == classes[0]
+
+    scores = np.empty((len(folds), len(n_neighbors)))
+    for i, fold in enumerate(folds):
+        train_positive = labels[fold["train_index"]] == pos_label
+        test_positive = labels[fold["test_index"]] == pos_label
+
+        neighbor_index = NearestNeighbors(n_neighbors=n_neighbors.max()).fit(
+            fold["scaled_train"]
+        ).kneighbors(fold["scaled_test"], return_distance=False)
+        positive_votes = np.cumsum(train_positive[neighbor_index], axis=1)[:, n_neighbors - 1]
+        if ties_are_positive:
+            predicted_positive = 2 * positive_votes >= n_neighbors
+        else:
+            predicted_positive = 2 * positive_votes > n_neighbors
+
+        true_positives = (predicted_positive & test_positive[:, None]).sum(axis=0)
+        false_positives = (predicted_positive & ~test_positive[:, None]).sum(axis=0)
+        false_negatives = (~predicted_positive & test_positive[:, None]).sum(axis=0)
+        scores[i] = _fbeta(true_positives, false_positives, false_negatives, beta)
+
+    return pd.DataFrame({
+        "n_neighbors": n_neighbors,
+        "mean_test_score": scores.mean(axis=0),
+        "std_test_score": scores.std(axis=0)
+    })
+
+
+def out_of_fold_scores(folds, labels, n_neighbors, pos_label="Malignant"):
+    """
+    Compute the out-of-fold fraction of positive-class neighbours of every observation.
+
+    Each observation is scored by the fold it is held out in: its `n_neighbors`
+    nearest training observations of that fold are looked up in one query per
+    fold, and the fraction of them labelled `pos_label` is recorded. This is the
+    `pos_label` column of `predict_proba` of a KNeighborsClassifier fit on the
+    fold's training observations, so decision thresholds and conformal quantiles
+    can be chosen on these scores without touching the test data.
+
+    Parameters
+    ----------
+    folds : list of dict
+        Scaled cross-validation folds as returned by `scaled_folds`.
+    labels : array-like
+        The class label of each observation, indexed by the fold indices.
+    n_neighbors : int
+        The number of neighbours, e.g. the value of k chosen by `tune_n_neighbors`.
+    pos_label : str, optional
+        The class whose neighbour fraction is returned. Default is 'Malignant'.
+
+    Returns
+    -------
+    numpy.ndarray
+        The out-of-fold score of each observation, in the order of `labels`.
+
+    Raises
+    ------
+    ValueError
+        If `n_neighbors` is not positive, or the folds do not hold out every
+        observation exactly once.
+    """
+    labels = np.asarray(labels)
+    if n_neighbors < 1:
+        raise ValueError("n_neighbors must be a positive integer.")
+    held_out = np.concatenate([fold["test_index"] for fold in folds])
+    if len(held_out) != len(labels) or len(np.unique(held_out)) != len(labels):
+        raise ValueError("The folds must hold out every observation exactly once.")
+
+    scores = np.empty(len(labels))
+    for fold in folds:
+        train_positive = labels[fold["train_index"]] == pos_label
+        neighbor_index = NearestNeighbors(n_neighbors=n_neighbors).fit(
+            fold["scaled_train"]
+        ).kneighbors(fold["scaled_test"], return_distance=False)
+        scores[fold["test_index"]] = train_positive[neighbor_index].mean(axis=1)
+    return scores
+
+
+def _fbeta(true_positives, false_positives, false_negatives, beta):
+    # same definition as sklearn's fbeta_score, including 0 when there are no positives
+    numerator = (1 + beta**2) * true_positives
+    denominator = numerator + beta**2 * false_negatives + false_positives
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
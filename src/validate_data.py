@@ -1,8 +1,9 @@
 import pandas as pd
 import pandera as pa
+from src.dataset_specs import DATASET_SPECS, FEATURE_RANGES
 
 
-def validate_data(cancer_dataframe):
+def validate_data(cancer_dataframe, dtype="float64", spec=None):
     """
     Validates the input cancer data in the form of a pandas DataFrame against a predefined schema,
     and returns the validated DataFrame.
@@ -16,6 +17,13 @@ def validate_data(cancer_dataframe):
         The DataFrame containing cancer-related data, which includes columns such as 'class', 'mean_radius', 
         'mean_texture', and other related measurements. The data is validated based on specific criteria for 
         each column.
+    dtype : str, optional
+        The floating point dtype expected for the measurement columns, e.g. 'float64' or 'float32'.
+        Default is 'float64'.
+    spec : dict, optional
+        The dataset spec (see `src.dataset_specs`) giving the class names, the
+        measurement columns and their ranges, and whether duplicate rows are an
+        error. Default is None (the WDBC data set).
 
     Returns
     -------
@@ -31,53 +39,29 @@ def validate_data(cancer_dataframe):
     Notes
     -----
     The following columns are validated:
-        - 'class': Values must be either 'Benign' or 'Malignant'.
+        - 'class': Values must be one of the spec's class names ('Benign' or 'Malignant' for WDBC).
         - Measurement columns (e.g., 'mean_radius', 'mean_texture', etc.) must fall within specific ranges.
-        - Additional checks ensure there are no duplicate or completely empty rows in the DataFrame.
+        - Additional checks ensure there are no completely empty rows in the DataFrame,
+          and no duplicate rows unless the spec allows them.
     """
     if not isinstance(cancer_dataframe, pd.DataFrame):
         raise TypeError("Input must be a pandas DataFrame")    
     if cancer_dataframe.empty:
         raise ValueError("Dataframe must contain observations.")
-    
+    spec = DATASET_SPECS["wdbc"] if spec is None else spec
+
+    checks = [pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")]
+    if spec["unique_rows"]:
+        checks.append(pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."))
     schema = pa.DataFrameSchema(
         {
-            "class": pa.Column(str, pa.Check.isin(["Benign", "Malignant"]), nullable=False),
-            "mean_radius": pa.Column(float, pa.Check.between(5, 45), nullable=True),
-            "mean_texture": pa.Column(float, pa.Check.between(5, 50), nullable=True),
-            "mean_perimeter": pa.Column(float, pa.Check.between(40, 260), nullable=True), 
-            "mean_area": pa.Column(float, pa.Check.between(140, 4300), nullable=True),
-            "mean_smoothness": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "mean_compactness": pa.Column(float, pa.Check.between(0, 2), nullable=True),
-            "mean_concavity": pa.Column(float, pa.Check.between(0, 2), nullable=True),
-            "mean_concave_points": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "mean_symmetry": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "mean_fractal_dimension": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_radius": pa.Column(float, pa.Check.between(0, 3), nullable=True),
-            "se_texture": pa.Column(float, pa.Check.between(0, 5), nullable=True),
-            "se_perimeter": pa.Column(float, pa.Check.between(0, 22), nullable=True), 
-            "se_area": pa.Column(float, pa.Check.between(6, 550), nullable=True),
-            "se_smoothness": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_compactness": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_concavity": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_concave_points": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_symmetry": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "se_fractal_dimension": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "max_radius": pa.Column(float, pa.Check.between(5, 40), nullable=True),
-            "max_texture": pa.Column(float, pa.Check.between(5, 50), nullable=True),
-            "max_perimeter": pa.Column(float, pa.Check.between(40, 260), nullable=True), 
-            "max_area": pa.Column(float, pa.Check.between(140, 4300), nullable=True),
-            "max_smoothness": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "max_compactness": pa.Column(float, pa.Check.between(0, 2), nullable=True),
-            "max_concavity": pa.Column(float, pa.Check.between(0, 2), nullable=True),
-            "max_concave_points": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "max_symmetry": pa.Column(float, pa.Check.between(0, 1), nullable=True),
-            "max_fractal_dimension": pa.Column(float, pa.Check.between(0, 1), nullable=True)
+            "class": pa.Column(str, pa.Check.isin(list(spec["labels"].values())), nullable=False),
+            **{
+                column: pa.Column(dtype, pa.Check.between(low, high), nullable=True)
+                for column, (low, high) in spec["feature_ranges"].items()
+            }
         },
-        checks=[
-            pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
-            pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")
-        ]
+        checks=checks
     )
 
     schema.validate(cancer_dataframe, lazy=True)
\ No newline at end of file
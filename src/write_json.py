@@ -0,0 +1,46 @@
+import json
+import os
+import numpy as np
+
+def write_json(dictionary: dict, directory: str, filename: str):
+    """
+    Save a dictionary to a JSON file in the specified directory.
+
+    NumPy scalars and arrays in the dictionary are written as plain JSON numbers and lists.
+
+    Parameters
+    ----------
+    dictionary : dict
+        The dictionary to save.
+    directory : str
+        The directory where the file will be saved.
+    filename : str
+        The name of the file (must include the '.json' extension).
+
+    Raises
+    ------
+    ValueError
+        If the filename does not end with '.json', or the dictionary is empty.
+    FileNotFoundError
+        If the specified directory does not exist.
+    TypeError
+        If the input is not a dictionary.
+    """
+    if not filename.endswith(".json"):
+        raise ValueError("Filename must end with '.json'")
+    if not os.path.exists(directory):
+        raise FileNotFoundError(f"Directory {directory} does not exist.")
+    if not isinstance(dictionary, dict):
+        raise TypeError("Input must be a dictionary")
+    if not dictionary:
+        raise ValueError("Dictionary must not be empty.")
+
+    filepath = os.path.join(directory, filename)
+    with open(filepath, "w") as f:
+        json.dump(dictionary, f, indent=2, default=_numpy_to_builtin)
+
+
+def _numpy_to_builtin(value):
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.compare_benchmarks import compare_benchmarks
+
+@pytest.fixture
+def baseline():
+    return {"timings": [
+        {"stage": "validate", "n_rows": 1000, "dtype": "float64", "seconds": 1.0},
+        {"stage": "tune", "n_rows": 1000, "dtype": "float64", "seconds": 2.0},
+        {"stage": "predict", "n_rows": 1000, "dtype": "float64", "seconds": 0.5},
+    ]}
+
+@pytest.fixture
+def current():
+    return {"timings": [
+        {"stage": "validate", "n_rows": 1000, "dtype": "float64", "seconds": 1.05},
+        {"stage": "tune", "n_rows": 1000, "dtype": "float64", "seconds": 3.0},
+        {"stage": "csv_read", "n_rows": 1000, "dtype": "float64", "seconds": 0.1},
+    ]}
+
+def test_compare_benchmarks_only_common_stages(baseline, current):
+    comparison = compare_benchmarks(baseline, current)
+    assert sorted(comparison["stage"]) == ["tune", "validate"]
+
+def test_compare_benchmarks_ratio_and_regression(baseline, current):
+    comparison = compare_benchmarks(baseline, current, tolerance=0.10).set_index("stage")
+    assert comparison.loc["tune", "ratio"] == pytest.approx(1.5)
+    assert comparison.loc["tune", "regression"]
+    assert not comparison.loc["validate", "regression"]
+
+def test_compare_benchmarks_tolerance(baseline, current):
+    comparison = compare_benchmarks(baseline, current, tolerance=0.6)
+    assert not comparison["regression"].any()
+
+def test_compare_benchmarks_ignores_millisecond_noise():
+    baseline = {"timings": [
+        {"stage": "parquet_read", "n_rows": 1000, "dtype": "float64", "seconds": 0.004},
+        {"stage": "tune", "n_rows": 1000, "dtype": "float64", "seconds": 0.2},
+    ]}
+    current = {"timings": [
+        {"stage": "parquet_read", "n_rows": 1000, "dtype": "float64", "seconds": 0.006},
+        {"stage": "tune", "n_rows": 1000, "dtype": "float64", "seconds": 0.3},
+    ]}
+    comparison = compare_benchmarks(baseline, current).set_index("stage")
+    assert comparison.loc["parquet_read", "ratio"] == pytest.approx(1.5)
+    assert not comparison.loc["parquet_read", "regression"]
+    assert comparison.loc["tune", "regression"]
+    assert compare_benchmarks(baseline, current, min_slowdown=0)["regression"].all()
+
+def test_compare_benchmarks_nothing_in_common(baseline):
+    other = {"timings": [{"stage": "validate", "n_rows": 10, "dtype": "float64", "seconds": 1.0}]}
+    with pytest.raises(ValueError, match="no stages and sizes in common"):
+        compare_benchmarks(baseline, other)
+
+def test_compare_benchmarks_negative_tolerance(baseline, current):
+    with pytest.raises(ValueError, match="tolerance must be non-negative."):
+        compare_benchmarks(baseline, current, tolerance=-0.1)
+    with pytest.raises(ValueError, match="min_slowdown must be non-negative."):
+        compare_benchmarks(baseline, current, min_slowdown=-0.1)
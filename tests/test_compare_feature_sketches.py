@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_sketch import make_feature_sketch, update_feature_sketch
+from src.compare_feature_sketches import compare_feature_sketches
+from src.validate_data import FEATURE_RANGES
+from src.generate_synthetic_data import generate_synthetic_data
+
+RANGES = {"a": (0.0, 10.0), "b": (0.0, 1.0)}
+
+def sketch_of(a, b):
+    return update_feature_sketch(make_feature_sketch(RANGES, n_bins=16), pd.DataFrame({"a": a, "b": b}))
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(2)
+    return sketch_of(rng.uniform(0, 10, 5000), rng.uniform(0, 1, 5000))
+
+def test_compare_feature_sketches_same_distribution(reference):
+    rng = np.random.default_rng(3)
+    drift = compare_feature_sketches(reference, sketch_of(rng.uniform(0, 10, 5000), rng.uniform(0, 1, 5000)))
+    assert list(drift["feature"]) == ["a", "b"]
+    assert (drift["psi"] < 0.05).all()
+    assert (drift["ks"] < 0.05).all()
+    assert (drift["out_of_range_fraction"] == 0).all()
+
+def test_compare_feature_sketches_detects_shift(reference):
+    rng = np.random.default_rng(4)
+    drift = compare_feature_sketches(reference, sketch_of(rng.uniform(5, 15, 5000), rng.uniform(0, 1, 5000)))
+    shifted = drift.set_index("feature").loc["a"]
+    assert shifted["psi"] > 1
+    assert shifted["ks"] == pytest.approx(0.5, abs=0.05)
+    assert shifted["mean_shift"] == pytest.approx(5 / np.sqrt(100 / 12), abs=0.1)
+    assert shifted["out_of_range_fraction"] == pytest.approx(0.5, abs=0.05)
+
+def test_compare_feature_sketches_missing_values(reference):
+    drift = compare_feature_sketches(reference, sketch_of([1.0, np.nan, np.nan, np.nan], [0.5] * 4))
+    assert list(drift["missing_fraction"]) == [0.75, 0.0]
+
+def test_compare_feature_sketches_empty_current(reference):
+    drift = compare_feature_sketches(reference, make_feature_sketch(RANGES, n_bins=16))
+    assert drift[["psi", "ks", "mean_shift", "mean_current"]].isna().all().all()
+
+def test_compare_feature_sketches_mismatched(reference):
+    with pytest.raises(ValueError, match="same features, ranges and bins"):
+        compare_feature_sketches(reference, make_feature_sketch(RANGES, n_bins=8))
+
+def test_compare_feature_sketches_empty_reference(reference):
+    with pytest.raises(ValueError, match="without observations"):
+        compare_feature_sketches(make_feature_sketch(RANGES, n_bins=16), reference)
+
+def test_compare_feature_sketches_in_distribution_split_not_flagged():
+    # a WDBC-sized data set split like split_n_preprocess.py, so both parts have the same distribution
+    cancer = generate_synthetic_data(569, seed=21)
+    train, test = train_test_split(cancer, train_size=0.70, stratify=cancer["class"], random_state=22)
+    reference = update_feature_sketch(make_feature_sketch(FEATURE_RANGES), train)
+    current = update_feature_sketch(make_feature_sketch(FEATURE_RANGES), test)
+    drift = compare_feature_sketches(reference, current)
+    assert not drift["drifted"].any()
+    assert (drift["psi"] < 0.2).all()
+
+def test_compare_feature_sketches_flags_shift_with_small_samples():
+    rng = np.random.default_rng(12)
+    reference = sketch_of(rng.uniform(0, 10, 400), rng.uniform(0, 1, 400))
+    drift = compare_feature_sketches(reference, sketch_of(rng.uniform(3, 13, 170), rng.uniform(0, 1, 170)))
+    assert list(drift["drifted"]) == [True, False]
@@ -0,0 +1,50 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.conformal_prediction import conformal_quantile, conformal_prediction_sets
+
+CLASSES = np.array(["Benign", "Malignant"])
+
+def simulate(n, seed):
+    rng = np.random.default_rng(seed)
+    labels = np.where(rng.random(n) < 0.4, "Malignant", "Benign")
+    malignant = rng.binomial(7, np.where(labels == "Malignant", 0.7, 0.2)) / 7
+    return np.column_stack([1 - malignant, malignant]), labels
+
+def test_conformal_quantile_is_order_statistic():
+    probabilities = np.array([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4], [0.3, 0.7]])
+    labels = ["Benign", "Malignant", "Malignant", "Benign"]
+    # nonconformity scores 0.1, 0.2, 0.6, 0.7; rank ceil(5 * 0.5) = 3
+    assert conformal_quantile(probabilities, labels, CLASSES, alpha=0.5) == pytest.approx(0.6)
+
+def test_conformal_quantile_too_few_observations():
+    probabilities, labels = simulate(5, seed=7)
+    with pytest.raises(ValueError, match="too few for alpha = 0.1; at least 9 are needed"):
+        conformal_quantile(probabilities, labels, CLASSES, alpha=0.1)
+    # nine observations are just enough: rank ceil(10 * 0.9) = 9
+    probabilities, labels = simulate(9, seed=7)
+    assert np.isfinite(conformal_quantile(probabilities, labels, CLASSES, alpha=0.1))
+
+def test_conformal_prediction_sets_coverage():
+    probabilities, labels = simulate(2000, seed=8)
+    quantile = conformal_quantile(probabilities[:1000], labels[:1000], CLASSES, alpha=0.1)
+    sets = conformal_prediction_sets(probabilities[1000:], quantile, CLASSES)
+    assert list(sets.columns) == list(CLASSES)
+    covered = sets.to_numpy()[np.arange(1000), np.searchsorted(CLASSES, labels[1000:])]
+    assert covered.mean() >= 0.88
+
+def test_conformal_prediction_sets_infinite_quantile():
+    probabilities, _ = simulate(10, seed=9)
+    assert conformal_prediction_sets(probabilities, np.inf, CLASSES).all().all()
+
+def test_conformal_quantile_invalid_alpha():
+    probabilities, labels = simulate(10, seed=10)
+    with pytest.raises(ValueError, match="alpha must be between 0 and 1"):
+        conformal_quantile(probabilities, labels, CLASSES, alpha=1.5)
+
+def test_conformal_quantile_unknown_label():
+    probabilities, _ = simulate(2, seed=11)
+    with pytest.raises(ValueError, match="calibration_labels must be one of"):
+        conformal_quantile(probabilities, ["Benign", "Unknown"], CLASSES)
@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_sketch import (
+    make_feature_sketch, update_feature_sketch, sketch_quantiles, save_feature_sketch, load_feature_sketch
+)
+
+@pytest.fixture
+def ranges():
+    return {"a": (0.0, 10.0), "b": (-1.0, 1.0)}
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "class": ["Benign"] * 500,
+        "a": rng.uniform(0, 10, 500),
+        "b": rng.uniform(-1, 1, 500)
+    })
+
+def test_make_feature_sketch_empty(ranges):
+    sketch = make_feature_sketch(ranges, n_bins=8)
+    assert list(sketch["columns"]) == ["a", "b"]
+    assert sketch["histogram"].shape == (2, 10)
+    assert sketch["count"].sum() == 0
+
+def test_make_feature_sketch_invalid_range():
+    with pytest.raises(ValueError, match="low < high"):
+        make_feature_sketch({"a": (1.0, 1.0)})
+
+def test_make_feature_sketch_invalid_bins(ranges):
+    with pytest.raises(ValueError, match="n_bins"):
+        make_feature_sketch(ranges, n_bins=0)
+
+def test_update_feature_sketch_matches_pandas(ranges, batch):
+    sketch = update_feature_sketch(make_feature_sketch(ranges), batch)
+    assert np.allclose(sketch["mean"], batch[["a", "b"]].mean())
+    assert np.allclose(sketch["m2"] / sketch["count"], batch[["a", "b"]].var(ddof=0))
+    assert (sketch["histogram"].sum(axis=1) == 500).all()
+
+def test_update_feature_sketch_batches_are_equivalent(ranges, batch):
+    whole = update_feature_sketch(make_feature_sketch(ranges), batch)
+    pieces = make_feature_sketch(ranges)
+    for start in range(0, len(batch), 130):
+        update_feature_sketch(pieces, batch.iloc[start:start + 130])
+    assert np.array_equal(whole["histogram"], pieces["histogram"])
+    assert np.allclose(whole["mean"], pieces["mean"])
+    assert np.allclose(whole["m2"], pieces["m2"])
+
+def test_update_feature_sketch_missing_and_out_of_range(ranges):
+    batch = pd.DataFrame({"a": [-5.0, 10.0, 1e6, np.nan], "b": [0.0, 1.0, 2.0, -1.0]})
+    sketch = update_feature_sketch(make_feature_sketch(ranges, n_bins=4), batch)
+    assert list(sketch["missing"]) == [1, 0]
+    assert list(sketch["count"]) == [3, 4]
+    assert sketch["n_rows"][0] == 4
+    # below range, upper bound in last in-range bin, above range
+    assert list(sketch["histogram"][0]) == [1, 0, 0, 0, 1, 1]
+    assert list(sketch["histogram"][1]) == [0, 1, 0, 1, 1, 1]
+
+def test_update_feature_sketch_missing_column(ranges):
+    with pytest.raises(ValueError, match="missing columns"):
+        update_feature_sketch(make_feature_sketch(ranges), pd.DataFrame({"a": [1.0]}))
+
+def test_update_feature_sketch_invalid_type(ranges):
+    with pytest.raises(TypeError, match="Input must be a pandas DataFrame"):
+        update_feature_sketch(make_feature_sketch(ranges), [[1.0, 0.0]])
+
+def test_sketch_quantiles(ranges, batch):
+    sketch = update_feature_sketch(make_feature_sketch(ranges), batch)
+    quantiles = sketch_quantiles(sketch, [0.1, 0.5, 0.9])
+    exact = batch[["a", "b"]].quantile([0.1, 0.5, 0.9]).T
+    # accurate to within one bin width
+    assert np.all(np.abs(quantiles.to_numpy() - exact.to_numpy()) <= np.array([[10 / 64], [2 / 64]]))
+
+def test_sketch_quantiles_empty_feature(ranges):
+    quantiles = sketch_quantiles(make_feature_sketch(ranges), [0.5])
+    assert quantiles[0.5].isna().all()
+
+def test_save_and_load_feature_sketch(ranges, batch, tmp_path):
+    sketch = update_feature_sketch(make_feature_sketch(ranges), batch)
+    filepath = os.path.join(tmp_path, "sketch.npz")
+    save_feature_sketch(sketch, filepath)
+    loaded = load_feature_sketch(filepath)
+    assert loaded.keys() == sketch.keys()
+    for name in sketch:
+        assert np.array_equal(loaded[name], sketch[name])
+
+def test_save_feature_sketch_invalid_filename(ranges, tmp_path):
+    with pytest.raises(ValueError, match="Filename must end with '.npz'"):
+        save_feature_sketch(make_feature_sketch(ranges), os.path.join(tmp_path, "sketch.pickle"))
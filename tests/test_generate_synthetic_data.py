@@ -0,0 +1,46 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.generate_synthetic_data import generate_synthetic_data
+from src.validate_data import validate_data, FEATURE_RANGES
+
+def test_generate_synthetic_data_schema():
+    synthetic = generate_synthetic_data(500, seed=1)
+    assert synthetic.shape == (500, 31)
+    assert list(synthetic.columns) == ["class"] + list(FEATURE_RANGES)
+    assert set(synthetic["class"]) == {"Benign", "Malignant"}
+    assert (synthetic.drop(columns=["class"]).dtypes == np.float64).all()
+
+def test_generate_synthetic_data_passes_validation():
+    validate_data(generate_synthetic_data(2000, seed=2))
+
+def test_generate_synthetic_data_within_ranges():
+    synthetic = generate_synthetic_data(5000, seed=3)
+    for column, (low, high) in FEATURE_RANGES.items():
+        assert synthetic[column].between(low, high).all()
+
+def test_generate_synthetic_data_is_reproducible():
+    pd.testing.assert_frame_equal(
+        generate_synthetic_data(100, seed=4),
+        generate_synthetic_data(100, seed=4)
+    )
+
+def test_generate_synthetic_data_class_balance():
+    synthetic = generate_synthetic_data(10000, seed=5, malignant_fraction=0.37)
+    assert (synthetic["class"] == "Malignant").mean() == pytest.approx(0.37, abs=0.02)
+
+def test_generate_synthetic_data_features_separate_classes():
+    synthetic = generate_synthetic_data(2000, seed=6)
+    means = synthetic.groupby("class")["mean_area"].mean()
+    assert means["Malignant"] > means["Benign"]
+
+def test_generate_synthetic_data_invalid_n_rows():
+    with pytest.raises(ValueError, match="n_rows must be a positive integer."):
+        generate_synthetic_data(0)
+
+def test_generate_synthetic_data_invalid_malignant_fraction():
+    with pytest.raises(ValueError, match="malignant_fraction must be between 0 and 1."):
+        generate_synthetic_data(10, malignant_fraction=1.5)
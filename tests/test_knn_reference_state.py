@@ -0,0 +1,171 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from sklearn.metrics import fbeta_score
+from sklearn.model_selection import LeaveOneOut, cross_val_predict
+from sklearn.neighbors import KNeighborsClassifier, NearestNeighbors
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from sklearn.compose import make_column_transformer, make_column_selector
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.knn_reference_state import (
+    build_reference_state, refresh_reference_state, score_reference_state, save_reference_state,
+    load_reference_state, reference_data, known_rows, reference_preprocessor
+)
+
+COLUMNS = ["a", "b", "c"]
+GRID = [1, 2, 5, 8]
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(5)
+    labels = np.where(rng.random(160) < 0.4, "Malignant", "Benign")
+    features = rng.normal(size=(160, 3)) + (labels == "Malignant")[:, None]
+    return features, labels
+
+def test_build_reference_state_matches_leave_one_out(data):
+    features, labels = data
+    scores = score_reference_state(build_reference_state(features, labels, COLUMNS, GRID))
+    for k, score in zip(GRID, scores["test_score"]):
+        predicted = cross_val_predict(
+            make_pipeline(StandardScaler(), KNeighborsClassifier(n_neighbors=k)), features, labels, cv=LeaveOneOut()
+        )
+        # the scaler is fit on all rows rather than per left-out row, so allow a small difference
+        assert score == pytest.approx(fbeta_score(labels, predicted, pos_label="Malignant", beta=2), abs=0.02)
+
+def test_refresh_reference_state_matches_rebuilt_neighbours(data):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    for start, stop in [(100, 130), (130, 131), (131, 160)]:
+        state, rebuilt = refresh_reference_state(state, features[start:stop], labels[start:stop], tolerance=np.inf)
+        assert not rebuilt
+    assert state["count"][0] == 160
+    neighbor_index = NearestNeighbors(n_neighbors=max(GRID)).fit(state["scaled"][:160]).kneighbors(return_distance=False)
+    assert np.array_equal(state["neighbor_index"][:160], neighbor_index)
+
+    # same counts as scoring the updated neighbour lists from scratch
+    positive = state["labels"][:160] == "Malignant"
+    for i, k in enumerate(GRID):
+        votes = positive[neighbor_index[:, :k]].sum(axis=1)
+        predicted = 2 * votes > k
+        assert state["true_positives"][i] == (predicted & positive).sum()
+        assert state["false_positives"][i] == (predicted & ~positive).sum()
+        assert state["false_negatives"][i] == (~predicted & positive).sum()
+
+def test_refresh_reference_state_merges_moments(data):
+    features, labels = data
+    state, _ = refresh_reference_state(
+        build_reference_state(features[:100], labels[:100], COLUMNS, GRID), features[100:], labels[100:], tolerance=np.inf
+    )
+    assert np.allclose(state["mean"], features.mean(axis=0))
+    assert np.allclose(state["m2"] / state["count"], features.var(axis=0))
+    # the neighbour lists keep the standardization they were built in
+    assert np.allclose(state["geometry_mean"], features[:100].mean(axis=0))
+
+def test_reference_preprocessor_uses_merged_moments(data):
+    features, labels = data
+    state, _ = refresh_reference_state(
+        build_reference_state(features[:100], labels[:100], COLUMNS, GRID), features[100:], labels[100:], tolerance=np.inf
+    )
+    reference = pd.DataFrame(features, columns=COLUMNS)
+    preprocessor = make_column_transformer(
+        (StandardScaler(), make_column_selector(pattern="[ab]")), remainder="passthrough", verbose_feature_names_out=False
+    )
+    np.testing.assert_allclose(
+        reference_preprocessor(state, preprocessor).transform(reference),
+        preprocessor.fit(reference).transform(reference)
+    )
+    np.testing.assert_allclose(
+        reference_preprocessor(state, StandardScaler()).transform(reference),
+        StandardScaler().fit(reference).transform(reference)
+    )
+    with pytest.raises(ValueError, match="only hold StandardScalers"):
+        reference_preprocessor(state, make_column_transformer((MinMaxScaler(), ["a"])))
+
+def test_known_rows_leaves_out_repeated_reference_rows(data):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    state, _ = refresh_reference_state(state, features[100:130], labels[100:130], tolerance=np.inf)
+    batch = np.concatenate([features[[3, 120]], features[130:140]])
+    assert known_rows(state, batch).tolist() == [True, True] + [False] * 10
+    assert not known_rows(state, features[[3]] + 1e-9).any()
+
+    # without the repeated rows the refresh matches a build on the distinct rows
+    batch_labels = np.concatenate([labels[[3, 120]], labels[130:140]])
+    new = ~known_rows(state, batch)
+    state, _ = refresh_reference_state(state, batch[new], batch_labels[new], tolerance=np.inf)
+    assert len(reference_data(state)[1]) == 140
+    neighbor_index = NearestNeighbors(n_neighbors=max(GRID)).fit(state["scaled"][:140]).kneighbors(return_distance=False)
+    assert np.array_equal(state["neighbor_index"][:140], neighbor_index)
+
+def test_refresh_reference_state_rebuilds_on_shift(data):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    state, rebuilt = refresh_reference_state(state, features[100:] + 3, labels[100:])
+    assert rebuilt
+    assert np.allclose(state["geometry_mean"], state["mean"])
+    assert len(reference_data(state)[1]) == 160
+
+def test_refresh_reference_state_invalid_inputs(data):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    with pytest.raises(ValueError, match="one column per column"):
+        refresh_reference_state(state, features[100:, :2], labels[100:])
+    with pytest.raises(ValueError, match="same number of observations"):
+        refresh_reference_state(state, features[100:], labels[101:])
+    with pytest.raises(ValueError, match="labels must be one of"):
+        refresh_reference_state(state, features[100:102], ["Benign", "Unknown"])
+
+def test_build_reference_state_invalid_inputs(data):
+    features, labels = data
+    with pytest.raises(ValueError, match="exactly two classes"):
+        build_reference_state(features, np.full(160, "Benign"), COLUMNS, GRID)
+    with pytest.raises(ValueError, match="positive integers"):
+        build_reference_state(features, labels, COLUMNS, [0, 1])
+    with pytest.raises(ValueError, match="more observations"):
+        build_reference_state(features[:8], labels[:8], COLUMNS, GRID)
+
+def test_save_and_load_reference_state_versions(data, tmp_path):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    assert save_reference_state(state, tmp_path) == 1
+    state, _ = refresh_reference_state(state, features[100:130], labels[100:130], tolerance=np.inf)
+    assert save_reference_state(state, tmp_path) == 2
+    state, _ = refresh_reference_state(state, features[130:], labels[130:], tolerance=np.inf)
+    assert save_reference_state(state, tmp_path) == 3
+    # refreshed versions are saved as deltas of the changed rows only
+    assert sorted(os.listdir(tmp_path)) == [
+        "reference_state_v0001.npz", "reference_state_v0002.delta.npz", "reference_state_v0003.delta.npz"
+    ]
+    with np.load(os.path.join(tmp_path, "reference_state_v0003.delta.npz")) as delta:
+        assert len(delta["rows"]) < 160
+        assert set(range(130, 160)) <= set(delta["rows"])
+
+    latest, version = load_reference_state(tmp_path)
+    assert version == 3
+    assert np.array_equal(latest["neighbor_index"][:160], state["neighbor_index"][:160])
+    assert np.array_equal(reference_data(latest)[0], features)
+    assert str(latest["pos_label"]) == "Malignant"
+    assert score_reference_state(latest).equals(score_reference_state(state))
+    earlier, _ = load_reference_state(tmp_path, version=2)
+    assert len(reference_data(earlier)[1]) == 130
+
+    # a loaded state keeps refreshing and saving deltas
+    latest, _ = refresh_reference_state(latest, features[:5] + 0.01, labels[:5], tolerance=np.inf)
+    assert save_reference_state(latest, tmp_path) == 4
+    assert os.path.exists(os.path.join(tmp_path, "reference_state_v0004.delta.npz"))
+
+def test_save_reference_state_after_rebuild_is_full(data, tmp_path):
+    features, labels = data
+    state = build_reference_state(features[:100], labels[:100], COLUMNS, GRID)
+    save_reference_state(state, tmp_path)
+    state, rebuilt = refresh_reference_state(state, features[100:] + 3, labels[100:])
+    assert rebuilt
+    assert save_reference_state(state, tmp_path) == 2
+    assert os.path.exists(os.path.join(tmp_path, "reference_state_v0002.npz"))
+
+def test_load_reference_state_missing(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No reference state found"):
+        load_reference_state(tmp_path)
@@ -0,0 +1,46 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_specs import DATASET_SPECS
+from src.process_dataset import process_dataset
+
+def write_raw_dataset(spec, directory, n_rows, missing_column, incomplete_rows, seed=1):
+    # a small headerless raw file in the spec's layout, with classes that differ in their feature values
+    rng = np.random.default_rng(seed)
+    codes = list(spec["labels"])
+    lines = []
+    for i in range(n_rows):
+        code = codes[i % 2]
+        values = {"id": str(100000 + i), "class": code, "time": str(rng.integers(1, 100))}
+        for column, (low, high) in spec["feature_ranges"].items():
+            position = rng.uniform(0.1, 0.6) + 0.3 * (code == codes[0])
+            value = low + (high - low) * position
+            values[column] = str(float(value))
+        if i in incomplete_rows:
+            values[missing_column] = "?"
+        lines.append(",".join(values[column] for column in spec["columns"]))
+    with open(os.path.join(directory, spec["filename"]), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    write_raw_dataset(DATASET_SPECS["wpbc"], tmp_path, 80, "lymph_node_status", incomplete_rows=[3, 10, 20, 41])
+    write_raw_dataset(DATASET_SPECS["bcw"], tmp_path, 80, "bare_nuclei", incomplete_rows=[5, 6, 30, 50, 61, 70])
+    return tmp_path
+
+@pytest.mark.parametrize("name, n_features, n_incomplete_rows", [("wpbc", 32, 4), ("bcw", 9, 6)])
+def test_process_dataset(raw_dir, name, n_features, n_incomplete_rows):
+    result = process_dataset(name, raw_dir, cv=5, n_neighbors=[1, 5, 9])
+    assert result["dataset"] == name
+    assert result["n_rows"] == 80
+    assert result["n_features"] == n_features
+    assert result["n_incomplete_rows"] == n_incomplete_rows
+    assert result["n_neighbors"] in [1, 5, 9]
+    assert 0 <= result["accuracy"] <= 1
+    assert all(result[stage] >= 0 for stage in ["read_seconds", "validate_seconds", "model_seconds"])
+
+def test_process_dataset_unknown_name(tmp_path):
+    with pytest.raises(ValueError, match="name must be one of"):
+        process_dataset("unknown", tmp_path)
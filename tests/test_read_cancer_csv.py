@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_csv import read_cancer_csv
+
+@pytest.fixture
+def cancer_csv(tmp_path):
+    filepath = os.path.join(tmp_path, "cancer.csv")
+    pd.DataFrame({
+        "class": ["Benign", "Malignant"],
+        "mean_radius": [6.1, 7.8],
+        "mean_area": [145.2, 156.1],
+    }).to_csv(filepath, index=False)
+    return filepath
+
+def test_read_cancer_csv_float64(cancer_csv):
+    cancer = read_cancer_csv(cancer_csv)
+    assert cancer["class"].tolist() == ["Benign", "Malignant"]
+    assert (cancer[["mean_radius", "mean_area"]].dtypes == np.float64).all()
+
+def test_read_cancer_csv_float32(cancer_csv):
+    cancer = read_cancer_csv(cancer_csv, dtype="float32")
+    assert cancer["class"].tolist() == ["Benign", "Malignant"]
+    assert (cancer[["mean_radius", "mean_area"]].dtypes == np.float32).all()
+    assert cancer["mean_radius"].tolist() == pytest.approx([6.1, 7.8])
+
+def test_read_cancer_csv_passes_read_csv_arguments(cancer_csv):
+    cancer = read_cancer_csv(cancer_csv, usecols=["class", "mean_area"])
+    assert list(cancer.columns) == ["class", "mean_area"]
+
+def test_read_cancer_csv_invalid_dtype(cancer_csv):
+    with pytest.raises(ValueError, match="dtype must be one of"):
+        read_cancer_csv(cancer_csv, dtype="int64")
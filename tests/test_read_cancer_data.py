@@ -0,0 +1,63 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_cancer_data import read_cancer_data, read_columns_to_drop
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        "class": ["Benign", "Malignant"],
+        "mean_radius": [6.1, 7.8],
+        "mean_area": [145.2, 156.1],
+        "se_area": [6.5, 12.0],
+    })
+
+@pytest.fixture
+def cancer_csv(sample_dataframe, tmp_path):
+    filepath = os.path.join(tmp_path, "cancer.csv")
+    sample_dataframe.to_csv(filepath, index=False)
+    return filepath
+
+@pytest.fixture
+def columns_to_drop_csv(tmp_path):
+    filepath = os.path.join(tmp_path, "columns_to_drop.csv")
+    pd.DataFrame({"feats_to_drop": ["mean_area", "se_area"]}).to_csv(filepath, index=False)
+    return filepath
+
+def test_read_columns_to_drop(columns_to_drop_csv):
+    assert read_columns_to_drop(columns_to_drop_csv) == ["mean_area", "se_area"]
+
+def test_read_cancer_data_all_columns(cancer_csv, sample_dataframe):
+    pd.testing.assert_frame_equal(read_cancer_data(cancer_csv), sample_dataframe)
+
+def test_read_cancer_data_projection_from_list(cancer_csv, sample_dataframe):
+    cancer = read_cancer_data(cancer_csv, columns_to_drop=["mean_radius"])
+    pd.testing.assert_frame_equal(cancer, sample_dataframe.drop(columns=["mean_radius"]))
+
+def test_read_cancer_data_projection_from_file(cancer_csv, columns_to_drop_csv):
+    cancer = read_cancer_data(cancer_csv, dtype="float32", columns_to_drop=columns_to_drop_csv)
+    assert list(cancer.columns) == ["class", "mean_radius"]
+    assert cancer["mean_radius"].dtype == np.float32
+
+def test_read_cancer_data_parquet(sample_dataframe, tmp_path):
+    pytest.importorskip("pyarrow")
+    filepath = os.path.join(tmp_path, "cancer.parquet")
+    sample_dataframe.to_parquet(filepath, index=False)
+    cancer = read_cancer_data(filepath, dtype="float32", columns_to_drop=["se_area"])
+    assert list(cancer.columns) == ["class", "mean_radius", "mean_area"]
+    assert (cancer[["mean_radius", "mean_area"]].dtypes == np.float32).all()
+
+def test_read_cancer_data_unknown_column(cancer_csv):
+    with pytest.raises(ValueError, match="Columns to drop not found"):
+        read_cancer_data(cancer_csv, columns_to_drop=["max_area"])
+
+def test_read_cancer_data_unsupported_file(tmp_path):
+    with pytest.raises(ValueError, match="Filename must end with '.csv' or '.parquet'"):
+        read_cancer_data(os.path.join(tmp_path, "cancer.txt"))
+
+def test_read_cancer_data_invalid_dtype(cancer_csv):
+    with pytest.raises(ValueError, match="dtype must be one of"):
+        read_cancer_data(cancer_csv, dtype="int64")
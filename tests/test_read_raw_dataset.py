@@ -0,0 +1,30 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_specs import BCW_SPEC, BCW_FEATURES, WDBC_SPEC, FEATURE_RANGES
+from src.read_raw_dataset import read_raw_dataset
+
+def test_read_raw_dataset_bcw(tmp_path):
+    filepath = os.path.join(tmp_path, "breast-cancer-wisconsin.data")
+    with open(filepath, "w") as f:
+        f.write("1000025,5,1,1,1,2,1,3,1,1,2\n1057013,8,4,5,1,2,?,7,3,1,4\n")
+    cancer = read_raw_dataset(BCW_SPEC, filepath)
+    assert list(cancer.columns) == BCW_FEATURES + ["class"]
+    assert list(cancer["class"]) == ["Benign", "Malignant"]
+    assert np.isnan(cancer.loc[1, "bare_nuclei"])
+    assert (cancer[BCW_FEATURES].dtypes == "float64").all()
+
+def test_read_raw_dataset_wdbc_float32(tmp_path):
+    filepath = os.path.join(tmp_path, "wdbc.data")
+    with open(filepath, "w") as f:
+        f.write("842302,M," + ",".join(["0.5"] * 30) + "\n")
+    cancer = read_raw_dataset(WDBC_SPEC, filepath, dtype="float32")
+    assert list(cancer.columns) == ["class"] + list(FEATURE_RANGES)
+    assert cancer.loc[0, "class"] == "Malignant"
+    assert (cancer[list(FEATURE_RANGES)].dtypes == "float32").all()
+
+def test_read_raw_dataset_invalid_dtype(tmp_path):
+    with pytest.raises(ValueError, match="dtype must be one of"):
+        read_raw_dataset(WDBC_SPEC, os.path.join(tmp_path, "wdbc.data"), dtype="int64")
@@ -0,0 +1,63 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.resolve_column_indices import resolve_column_indices
+
+@pytest.fixture
+def cancer_dataframe():
+    return pd.DataFrame({
+        "class": ["Benign", "Malignant", "Benign"],
+        "mean_radius": [6.1, 7.8, 12.0],
+        "mean_area": [145.2, 156.1, 400.3],
+        "se_area": [6.5, 12.0, 30.1],
+    })
+
+@pytest.fixture
+def cancer_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    )
+
+def test_resolve_column_indices_column_selector(cancer_dataframe, cancer_preprocessor):
+    resolved = resolve_column_indices(cancer_preprocessor, cancer_dataframe)
+    assert resolved.transformers[0][2] == [1, 2, 3]
+
+def test_resolve_column_indices_names_and_slices(cancer_dataframe):
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["se_area", "mean_radius"]),
+        (StandardScaler(), "mean_area"),
+        (StandardScaler(), slice("mean_radius", "mean_area")),
+        (StandardScaler(), [2, 3]),
+    )
+    resolved = resolve_column_indices(preprocessor, cancer_dataframe)
+    assert [columns for _, _, columns in resolved.transformers] == [[3, 1], [2], [1, 2], [2, 3]]
+
+def test_resolve_column_indices_returns_unfitted_clone(cancer_dataframe, cancer_preprocessor):
+    resolved = resolve_column_indices(cancer_preprocessor, cancer_dataframe)
+    assert resolved is not cancer_preprocessor
+    assert callable(cancer_preprocessor.transformers[0][2])
+
+def test_resolve_column_indices_matches_dataframe_output(cancer_dataframe, cancer_preprocessor):
+    features = cancer_dataframe.drop(columns=["class"])
+    expected = cancer_preprocessor.fit(features).transform(features)
+    resolved = resolve_column_indices(cancer_preprocessor, features)
+    actual = resolved.fit(features.to_numpy()).transform(features.to_numpy())
+    np.testing.assert_allclose(actual, np.asarray(expected))
+
+def test_resolve_column_indices_missing_column(cancer_dataframe):
+    preprocessor = make_column_transformer((StandardScaler(), ["max_area"]))
+    with pytest.raises(ValueError, match="Columns not found in the DataFrame"):
+        resolve_column_indices(preprocessor, cancer_dataframe)
+
+def test_resolve_column_indices_wrong_types(cancer_dataframe, cancer_preprocessor):
+    with pytest.raises(TypeError):
+        resolve_column_indices(StandardScaler(), cancer_dataframe)
+    with pytest.raises(TypeError):
+        resolve_column_indices(cancer_preprocessor, cancer_dataframe.to_numpy())
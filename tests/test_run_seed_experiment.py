@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.run_seed_experiment import run_seed_experiment
+from src.generate_synthetic_data import generate_synthetic_data
+
+@pytest.fixture
+def cancer():
+    synthetic = generate_synthetic_data(300, seed=11)
+    return np.ascontiguousarray(synthetic.drop(columns=["class"]).to_numpy()), synthetic["class"].to_numpy()
+
+def test_run_seed_experiment_result(cancer):
+    features, labels = cancer
+    result = run_seed_experiment(features, labels, seed=1, cv=5, n_neighbors=range(1, 30, 3))
+    assert set(result) == {"seed", "n_neighbors", "cv_score", "accuracy", "f2"}
+    assert result["seed"] == 1
+    assert result["n_neighbors"] in range(1, 30, 3)
+    for score in ["cv_score", "accuracy", "f2"]:
+        assert 0 <= result[score] <= 1
+
+def test_run_seed_experiment_is_reproducible(cancer):
+    features, labels = cancer
+    assert run_seed_experiment(features, labels, seed=2, cv=5) == run_seed_experiment(features, labels, seed=2, cv=5)
+
+def test_run_seed_experiment_label_codes(cancer):
+    # integer label codes (as shared between worker processes) give the same results as strings
+    features, labels = cancer
+    classes, codes = np.unique(labels, return_inverse=True)
+    from_strings = run_seed_experiment(features, labels, seed=3, cv=5)
+    from_codes = run_seed_experiment(features, codes.astype(np.int8), seed=3, cv=5,
+                                     pos_label=int(np.flatnonzero(classes == "Malignant")[0]))
+    assert from_strings == from_codes
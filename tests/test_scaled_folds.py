@@ -0,0 +1,131 @@
+import pytest
+import subprocess
+import sys
+import os
+import numpy as np
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.scaled_folds import scaled_folds
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(1).normal(10, 3, size=(60, 4))
+
+@pytest.fixture
+def labels():
+    return np.array(["Benign", "Malignant"] * 30)
+
+def test_scaled_folds_scaling(features, labels):
+    folds = scaled_folds(features, labels, cv=5)
+    assert len(folds) == 5
+    for fold in folds:
+        scaler = StandardScaler().fit(features[fold["train_index"]])
+        np.testing.assert_allclose(fold["mean"], scaler.mean_)
+        np.testing.assert_allclose(fold["scale"], scaler.scale_)
+        np.testing.assert_allclose(fold["scaled_train"], scaler.transform(features[fold["train_index"]]))
+        np.testing.assert_allclose(fold["scaled_test"], scaler.transform(features[fold["test_index"]]))
+
+def test_scaled_folds_are_stratified_partitions(features, labels):
+    folds = scaled_folds(features, labels, cv=5)
+    test_index = np.sort(np.concatenate([fold["test_index"] for fold in folds]))
+    np.testing.assert_array_equal(test_index, np.arange(60))
+    for fold in folds:
+        assert (labels[fold["test_index"]] == "Malignant").sum() == 6
+
+def test_scaled_folds_seed_shuffles(features, labels):
+    unshuffled = scaled_folds(features, labels, cv=5)
+    shuffled = scaled_folds(features, labels, cv=5, seed=1)
+    assert not np.array_equal(unshuffled[0]["test_index"], shuffled[0]["test_index"])
+
+def test_scaled_folds_cache_reuse(features, labels, tmp_path):
+    computed = scaled_folds(features, labels, cv=5, cache_dir=tmp_path)
+    assert len(os.listdir(tmp_path)) == 1
+    cached = scaled_folds(features, labels, cv=5, cache_dir=tmp_path)
+    assert len(os.listdir(tmp_path)) == 1
+    for computed_fold, cached_fold in zip(computed, cached):
+        for name, value in computed_fold.items():
+            np.testing.assert_array_equal(value, cached_fold[name])
+
+def test_scaled_folds_cache_key(features, labels, tmp_path):
+    scaled_folds(features, labels, cv=5, cache_dir=tmp_path)
+    scaled_folds(features, labels, cv=3, cache_dir=tmp_path)
+    scaled_folds(features, labels, cv=5, seed=2, cache_dir=tmp_path)
+    scaled_folds(features + 1, labels, cv=5, cache_dir=tmp_path)
+    assert len(os.listdir(tmp_path)) == 4
+
+def test_scaled_folds_preprocessor(features, labels):
+    preprocessor = make_column_transformer((MinMaxScaler(), [0, 1]), remainder="passthrough")
+    folds = scaled_folds(features, labels, cv=5, preprocessor=preprocessor)
+    for fold in folds:
+        fitted = make_column_transformer((MinMaxScaler(), [0, 1]), remainder="passthrough").fit(features[fold["train_index"]])
+        np.testing.assert_allclose(fold["scaled_train"], fitted.transform(features[fold["train_index"]]))
+        np.testing.assert_allclose(fold["scaled_test"], fitted.transform(features[fold["test_index"]]))
+        # no StandardScaler, so no scaler statistics
+        assert "mean" not in fold
+    # the passed preprocessor itself is left unfitted
+    assert not hasattr(preprocessor, "transformers_")
+
+def test_scaled_folds_column_transformer_statistics(features, labels, tmp_path):
+    preprocessor = make_column_transformer((StandardScaler(), [1, 3]), remainder="passthrough")
+    computed = scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=preprocessor)
+    cached = scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=preprocessor)
+    for computed_fold, cached_fold in zip(computed, cached):
+        scaler = StandardScaler().fit(features[computed_fold["train_index"]][:, [1, 3]])
+        np.testing.assert_allclose(computed_fold["mean"][[1, 3]], scaler.mean_)
+        np.testing.assert_allclose(computed_fold["scale"][[1, 3]], scaler.scale_)
+        assert np.isnan(computed_fold["mean"][[0, 2]]).all()
+        np.testing.assert_array_equal(cached_fold["scale"], computed_fold["scale"])
+
+def test_scaled_folds_cache_key_preprocessor(features, labels, tmp_path):
+    scaled_folds(features, labels, cv=5, cache_dir=tmp_path)
+    scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=MinMaxScaler())
+    scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=StandardScaler(with_mean=False))
+    assert len(os.listdir(tmp_path)) == 3
+    scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=MinMaxScaler())
+    assert len(os.listdir(tmp_path)) == 3
+
+def test_scaled_folds_cache_key_is_stable_across_processes(features, labels, tmp_path):
+    # a callable selector is resolved before hashing, so its memory address never enters the key
+    script = f"""
+import sys
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler
+sys.path.append({os.path.join(os.path.dirname(__file__), '..')!r})
+from src.scaled_folds import scaled_folds
+features = np.random.default_rng(1).normal(10, 3, size=(60, 4))
+labels = np.array(["Benign", "Malignant"] * 30)
+preprocessor = make_column_transformer((StandardScaler(), lambda X: [0, 1]), remainder="passthrough")
+scaled_folds(features, labels, cv=5, cache_dir=sys.argv[1], preprocessor=preprocessor)
+"""
+    for cache_dir in ["first", "second"]:
+        os.mkdir(tmp_path / cache_dir)
+        subprocess.run([sys.executable, "-c", script, str(tmp_path / cache_dir)], check=True)
+    assert os.listdir(tmp_path / "first") == os.listdir(tmp_path / "second")
+
+def test_scaled_folds_rejects_name_based_selectors(features, labels, tmp_path):
+    preprocessor = make_column_transformer((StandardScaler(), make_column_selector(dtype_include="number")))
+    with pytest.raises(ValueError, match="select the columns by position"):
+        scaled_folds(features, labels, cv=5, cache_dir=tmp_path, preprocessor=preprocessor)
+
+def test_scaled_folds_cache_eviction(features, labels, tmp_path):
+    for cv in [2, 3, 4]:
+        scaled_folds(features, labels, cv=cv, cache_dir=tmp_path, max_entries=2)
+        # keep modification times apart so the eviction order is deterministic
+        for i, filename in enumerate(sorted(os.listdir(tmp_path), key=lambda f: os.path.getmtime(os.path.join(tmp_path, f)))):
+            os.utime(os.path.join(tmp_path, filename), (i, i))
+    assert len(os.listdir(tmp_path)) == 2
+    # the cv=2 entry was the least recently used, so it has to be recomputed
+    scaled_folds(features, labels, cv=3, cache_dir=tmp_path, max_entries=2)
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_scaled_folds_invalid_inputs(features, labels, tmp_path):
+    with pytest.raises(TypeError, match="features must be a 2D NumPy array"):
+        scaled_folds(features.tolist(), labels)
+    with pytest.raises(ValueError, match="same number of rows"):
+        scaled_folds(features, labels[:-1])
+    with pytest.raises(ValueError, match="max_entries must be a positive integer"):
+        scaled_folds(features, labels, cache_dir=tmp_path, max_entries=0)
+    with pytest.raises(FileNotFoundError):
+        scaled_folds(features, labels, cache_dir=os.path.join(tmp_path, "missing"))
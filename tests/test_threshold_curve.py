@@ -0,0 +1,40 @@
+import pytest
+import sys
+import os
+import numpy as np
+from sklearn.metrics import fbeta_score, precision_score, recall_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.threshold_curve import threshold_curve
+
+@pytest.fixture
+def scores_and_labels():
+    rng = np.random.default_rng(6)
+    labels = np.where(rng.random(300) < 0.4, "Malignant", "Benign")
+    # vote fractions of 7 neighbours, higher for malignant observations
+    scores = np.clip(rng.binomial(7, np.where(labels == "Malignant", 0.7, 0.2)) / 7, 0, 1)
+    return scores, labels
+
+def test_threshold_curve_matches_sklearn(scores_and_labels):
+    scores, labels = scores_and_labels
+    curve = threshold_curve(scores, labels, pos_label="Malignant", beta=2)
+    assert list(curve["threshold"]) == sorted(np.unique(scores), reverse=True)
+    for _, row in curve.iterrows():
+        predicted = np.where(scores >= row["threshold"], "Malignant", "Benign")
+        assert row["n_predicted_positive"] == (predicted == "Malignant").sum()
+        assert row["precision"] == pytest.approx(precision_score(labels, predicted, pos_label="Malignant"))
+        assert row["recall"] == pytest.approx(recall_score(labels, predicted, pos_label="Malignant"))
+        assert row["fbeta"] == pytest.approx(fbeta_score(labels, predicted, pos_label="Malignant", beta=2))
+
+def test_threshold_curve_lowest_threshold_predicts_everything(scores_and_labels):
+    scores, labels = scores_and_labels
+    last = threshold_curve(scores, labels).iloc[-1]
+    assert last["n_predicted_positive"] == len(scores)
+    assert last["recall"] == 1
+
+def test_threshold_curve_length_mismatch():
+    with pytest.raises(ValueError, match="same length"):
+        threshold_curve([0.1, 0.9], ["Malignant"])
+
+def test_threshold_curve_no_positives():
+    with pytest.raises(ValueError, match="at least one observation of pos_label"):
+        threshold_curve([0.1, 0.9], ["Benign", "Benign"])
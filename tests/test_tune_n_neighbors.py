@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+import numpy as np
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.metrics import fbeta_score, make_scorer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.scaled_folds import scaled_folds
+from src.tune_n_neighbors import tune_n_neighbors, out_of_fold_scores
+from src.generate_synthetic_data import generate_synthetic_data
+
+@pytest.fixture
+def cancer():
+    return generate_synthetic_data(300, seed=7)
+
+@pytest.mark.parametrize("pos_label", ["Malignant", "Benign"])
+def test_tune_n_neighbors_matches_grid_search(cancer, pos_label):
+    features = np.ascontiguousarray(cancer.drop(columns=["class"]).to_numpy())
+    labels = cancer["class"].to_numpy()
+    n_neighbors = range(1, 40, 3)
+
+    grid = GridSearchCV(
+        make_pipeline(StandardScaler(), KNeighborsClassifier()),
+        param_grid={"kneighborsclassifier__n_neighbors": n_neighbors},
+        cv=5,
+        scoring=make_scorer(fbeta_score, pos_label=pos_label, beta=2)
+    ).fit(features, labels)
+
+    tuned = tune_n_neighbors(scaled_folds(features, labels, cv=5), labels, n_neighbors, pos_label=pos_label, beta=2)
+    assert tuned["n_neighbors"].tolist() == list(n_neighbors)
+    np.testing.assert_allclose(tuned["mean_test_score"], grid.cv_results_["mean_test_score"])
+    np.testing.assert_allclose(tuned["std_test_score"], grid.cv_results_["std_test_score"])
+
+def test_tune_n_neighbors_no_positive_predictions():
+    features = np.arange(20, dtype=float).reshape(-1, 1)
+    labels = np.array(["Benign"] * 18 + ["Malignant"] * 2)
+    tuned = tune_n_neighbors(scaled_folds(features, labels, cv=2), labels, [5])
+    assert tuned["mean_test_score"].tolist() == [0.0]
+
+def test_tune_n_neighbors_invalid_labels(cancer):
+    features = np.ascontiguousarray(cancer.drop(columns=["class"]).to_numpy())
+    labels = cancer["class"].to_numpy()
+    folds = scaled_folds(features, labels, cv=3)
+    with pytest.raises(ValueError, match="exactly two classes"):
+        tune_n_neighbors(folds, labels, [1, 3], pos_label="malignant")
+    with pytest.raises(ValueError, match="n_neighbors must be positive integers"):
+        tune_n_neighbors(folds, labels, [0, 3])
+
+def test_out_of_fold_scores_match_predict_proba(cancer):
+    features = np.ascontiguousarray(cancer.drop(columns=["class"]).to_numpy())
+    labels = cancer["class"].to_numpy()
+    folds = scaled_folds(features, labels, cv=5)
+    scores = out_of_fold_scores(folds, labels, 7, pos_label="Malignant")
+
+    expected = np.empty(len(labels))
+    for fold in folds:
+        fit = make_pipeline(StandardScaler(), KNeighborsClassifier(n_neighbors=7)).fit(
+            features[fold["train_index"]], labels[fold["train_index"]]
+        )
+        expected[fold["test_index"]] = fit.predict_proba(features[fold["test_index"]])[:, 1]
+    np.testing.assert_allclose(scores, expected)
+
+def test_out_of_fold_scores_invalid(cancer):
+    features = np.ascontiguousarray(cancer.drop(columns=["class"]).to_numpy())
+    labels = cancer["class"].to_numpy()
+    folds = scaled_folds(features, labels, cv=3)
+    with pytest.raises(ValueError, match="positive integer"):
+        out_of_fold_scores(folds, labels, 0)
+    with pytest.raises(ValueError, match="exactly once"):
+        out_of_fold_scores(folds[:2], labels, 3)
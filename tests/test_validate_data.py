@@ -6,6 +6,7 @@ import pandera as pa
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.validate_data import validate_data
+from src.dataset_specs import BCW_SPEC, BCW_FEATURES, WPBC_SPEC
 
 
 # Test data setup
@@ -120,5 +121,36 @@ invalid_data_cases.append((case_missing_obs, f"Check absent or incorrect for mis
 # Parameterize invalid data test cases
 @pytest.mark.parametrize("invalid_data, description", invalid_data_cases)
 def test_valid_w_invalid_data(invalid_data, description):
-    with pytest.raises(pa.errors.SchemaErrors) as:
-        validate_data(invalid_data)
\ No newline at end of file
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(invalid_data)
+
+# Case: float32 measurement columns pass when float32 is the expected dtype
+valid_data_float32 = valid_data.astype({col: "float32" for col in numeric_columns})
+def test_valid_data_float32():
+    validate_data(valid_data_float32, dtype="float32")
+
+# Case: float32 measurement columns fail when float64 is the expected dtype
+def test_valid_data_float32_when_float64_expected():
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(valid_data_float32)
+
+# Case: the original (BCW) data set allows duplicate rows and uses its own columns
+valid_bcw_data = pd.DataFrame({
+    "class": ["Benign", "Benign", "Malignant"],
+    **{feature: [1.0, 1.0, 10.0] for feature in BCW_FEATURES}
+})
+def test_valid_data_bcw_spec():
+    validate_data(valid_bcw_data, spec=BCW_SPEC)
+
+def test_valid_data_bcw_spec_out_of_range():
+    invalid_bcw_data = valid_bcw_data.copy()
+    invalid_bcw_data.loc[0, "mitoses"] = 11.0
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(invalid_bcw_data, spec=BCW_SPEC)
+
+# Case: the class names come from the spec
+def test_valid_data_wpbc_spec_class_names():
+    wpbc_data = valid_data.assign(tumor_size=2.0, lymph_node_status=[0.0, np.nan, 3.0])
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(wpbc_data, spec=WPBC_SPEC)
+    validate_data(wpbc_data.assign(**{"class": ["Recurrent", "Nonrecurrent", "Recurrent"]}), spec=WPBC_SPEC)
@@ -0,0 +1,47 @@
+import pytest
+import sys
+import os
+import json
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.write_json import write_json
+
+@pytest.fixture
+def sample_dictionary():
+    return {
+        "accuracy": 0.92,
+        "n_neighbors": 7,
+        "confusion_matrix": {"Benign": {"Benign": 102, "Malignant": 5}},
+    }
+
+def test_write_json_success(sample_dictionary, tmp_path):
+    write_json(sample_dictionary, tmp_path, "summary.json")
+    file_path = os.path.join(tmp_path, "summary.json")
+    assert os.path.isfile(file_path)
+    with open(file_path) as f:
+        assert json.load(f) == sample_dictionary
+
+def test_write_json_numpy_values(tmp_path):
+    write_json({"n_neighbors": np.int64(7), "scores": np.array([0.5, 0.75])}, tmp_path, "summary.json")
+    with open(os.path.join(tmp_path, "summary.json")) as f:
+        assert json.load(f) == {"n_neighbors": 7, "scores": [0.5, 0.75]}
+
+def test_write_json_invalid_filename(sample_dictionary, tmp_path):
+    with pytest.raises(ValueError, match="Filename must end with '.json'"):
+        write_json(sample_dictionary, tmp_path, "summary.txt")
+
+def test_write_json_nonexistent_directory(sample_dictionary):
+    with pytest.raises(FileNotFoundError, match="Directory /nonexistent_directory does not exist."):
+        write_json(sample_dictionary, "/nonexistent_directory", "summary.json")
+
+def test_write_json_invalid_type(tmp_path):
+    with pytest.raises(TypeError, match="Input must be a dictionary"):
+        write_json([1, 2], tmp_path, "summary.json")
+
+def test_write_json_empty_dictionary(tmp_path):
+    with pytest.raises(ValueError, match="Dictionary must not be empty."):
+        write_json({}, tmp_path, "summary.json")
+
+def test_write_json_unserializable_value(tmp_path):
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        write_json({"value": object()}, tmp_path, "summary.json")